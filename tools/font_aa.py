@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: LGPL-3.0-or-later
+# Copyright (C) 2020 Daniel Thompson
+
+"""Anti-aliased font generator.
+
+Generates a font module in the same form as ``font_to_py.py`` except that
+each pixel is a 2-bit or 4-bit coverage value rather than a single bit.
+Rows of pixels are packed most significant bits first and each row is
+padded to a whole number of bytes. The module gains a ``bpp()`` function
+which the drawing library uses to recognise the format.
+"""
+
+import argparse
+from PIL import Image, ImageDraw, ImageFont
+
+def render(fname, size, height, bpp, lo, hi):
+    """Render every character in the range into packed coverage bitmaps."""
+    font = ImageFont.truetype(fname, size)
+    (ascent, descent) = font.getmetrics()
+    top = (height - ascent - descent) // 2
+    levels = (1 << bpp) - 1
+
+    glyphs = []
+    for oc in [0x3f] + list(range(lo, hi + 1)):
+        ch = chr(oc)
+        width = max(int(round(font.getlength(ch))), 1)
+        im = Image.new('L', (width, height), 0)
+        ImageDraw.Draw(im).text((0, top), ch, fill=255, font=font)
+        pixels = im.load()
+
+        data = []
+        for y in range(height):
+            acc = 0
+            nbits = 0
+            for x in range(width):
+                acc = (acc << bpp) | ((pixels[x, y] * levels + 127) // 255)
+                nbits += bpp
+                if nbits == 8:
+                    data.append(acc)
+                    acc = 0
+                    nbits = 0
+            if nbits:
+                data.append(acc << (8 - nbits))
+        glyphs.append((width, bytes(data)))
+
+    return (glyphs, top + ascent)
+
+def print_bytes(name, data):
+    print(f'{name} =\\')
+    for i in range(0, len(data), 16):
+        line = ''.join(f'\\x{b:02x}' for b in data[i:i+16])
+        print(f"b'{line}'" + ('\\' if i + 16 < len(data) else ''))
+    print()
+
+parser = argparse.ArgumentParser(description='Anti-aliased font generator.')
+parser.add_argument('font', help='TrueType font to convert')
+parser.add_argument('size', type=int, help='Size of the font, in pixels')
+parser.add_argument('--height', type=int,
+                    help='Height of each glyph, defaults to the font size')
+parser.add_argument('--bpp', type=int, default=2, choices=(2, 4),
+                    help='Bits per pixel')
+parser.add_argument('-s', '--smallest', type=int, default=32,
+                    help='Ordinal of the first character')
+parser.add_argument('-l', '--largest', type=int, default=126,
+                    help='Ordinal of the last character')
+
+args = parser.parse_args()
+height = args.height if args.height else args.size
+(glyphs, baseline) = render(args.font, args.size, height, args.bpp,
+                            args.smallest, args.largest)
+
+font = bytearray()
+index = bytearray()
+for (width, data) in glyphs:
+    index += len(font).to_bytes(2, 'little')
+    font += width.to_bytes(2, 'little')
+    font += data
+
+print('# Code generated by font_aa.py.')
+print(f'# Font: {args.font}')
+print(f'# {args.bpp}-bit anti-aliased, {len(font) + len(index)} bytes')
+print(f'''
+def height():
+    return {height}
+
+def baseline():
+    return {baseline}
+
+def max_width():
+    return {max(g[0] for g in glyphs)}
+
+def hmap():
+    return True
+
+def reverse():
+    return False
+
+def monospaced():
+    return False
+
+def min_ch():
+    return {args.smallest}
+
+def max_ch():
+    return {args.largest}
+
+def bpp():
+    return {args.bpp}
+''')
+print_bytes('_font', font)
+print_bytes('_index', index)
+print(f'''_mvfont = memoryview(_font)
+_mvi = memoryview(_index)
+
+def get_ch(ch):
+    mvi = _mvi
+    mvfont = _mvfont
+
+    oc = ord(ch)
+    ioff = 2 * (oc - {args.smallest} + 1) if oc >= {args.smallest} and oc <= {args.largest} else 0
+    doff = mvi[ioff] | (mvi[ioff+1] << 8)
+    width = mvfont[doff] | (mvfont[doff+1] << 8)
+
+    next_offs = doff + 2 + ((width * {args.bpp} - 1)//8 + 1) * {height}
+    return _mvfont[doff + 2:next_offs], {height}, width''')
@@ -221,32 +221,41 @@ def encode_2bit(im):
     return bytes(rle)
 
 def encode_8bit(im):
-    """Experimental 8-bit RLE encoder.
-
-    For monochrome images this is about 3x less efficient than the 1-bit
-    encoder. This encoder is not currently used anywhere in wasp-os and
-    currently there is no decoder either (so don't assume this code
-    actually works).
+    """8-bit palette based RLE encoder.
+
+    Every run is coded as a CLUT8 colour followed by the run length. Run
+    lengths of 255 or longer are coded as a series of 255 bytes followed by
+    the remainder (which may be zero). For example a run of 300 pixels
+    is coded as 255, 45.
+
+    The encoding costs at least two bytes for every run, compared to one
+    for the 1-bit and 2-bit encoders, but it never pays anything extra
+    when a colour changes. That makes it the smallest encoding for
+    colourful images (such as photographs or logos with anti-aliased
+    edges) where the 2-bit encoder would be constantly reprogramming its
+    palette.
     """
     pixels = im.load()
+    assert(im.width <= 255)
+    assert(im.height <= 255)
+
+    full_palette = ReverseCLUT(clut8_rgb888)
 
     rle = []
     rl = 0
     px = pixels[0, 0]
 
     def encode_pixel(px, rl):
-        px = (px[0] & 0xe0) | ((px[1] & 0xe0) >> 3) | ((px[2] & 0xc0) >> 6)
+        rle.append(full_palette((px[0] << 16) + (px[1] << 8) + px[2]))
+        while rl >= 255:
+            rle.append(255)
+            rl -= 255
+        rle.append(rl)
 
-        rle.append(px)
-        if rl > 0:
-            rle.append(px)
-        rl -= 2
-        if rl > (1 << 14):
-            rle.append(0x80 | ((rl >> 14) & 0x7f))
-        if rl > (1 <<  7):
-            rle.append(0x80 | ((rl >>  7) & 0x7f))
-        if rl >= 0:
-            rle.append(         rl        & 0x7f )
+    # Issue the descriptor
+    rle.append(8)
+    rle.append(im.width)
+    rle.append(im.height)
 
     for y in range(im.height):
         for x in range(im.width):
@@ -266,7 +275,89 @@ def encode_8bit(im):
     # Handle the final run
     encode_pixel(px, rl)
 
-    return (im.width, im.height, bytes(rle))
+    return bytes(rle)
+
+def add_index(image, interval):
+    """Add a row index to a 2-bit or 8-bit RLE image.
+
+    The index allows part of an image to be decoded without decoding
+    everything that comes before it. It is stored between the descriptor
+    and the RLE data and the top bit of the format byte is set to show
+    that it is present:
+
+    * format | 0x80, width, height (the usual descriptor)
+    * interval, the number of rows between each index entry
+    * one 8 byte entry for every interval rows of the image
+    * the RLE data (unchanged)
+
+    Each entry describes the decoder state at the start of a row:
+
+    * offset (16-bit little endian), from the start of the image, of the
+      run that covers the first pixel of the row
+    * skip (16-bit little endian), the number of pixels of that run that
+      belong to earlier rows
+    * three CLUT8 colours holding the 2-bit palette (zero for 8-bit images)
+    * the next palette entry to be reprogrammed (bits 0-1) together with
+      a mask (bits 2-4) of the palette entries that have been reprogrammed
+      since the start of the image (zero for 8-bit images)
+    """
+    assert(image[0] in (2, 8))
+    assert(0 < interval <= 255)
+    sx = image[1]
+    sy = image[2]
+    nentries = (sy + interval - 1) // interval
+    header = 4 + 8 * nentries
+    assert(header + len(image) - 3 < (1 << 16))
+
+    index = []
+    palette = [0, 0, 0, 0]
+    next_color = 1
+    mask = 0
+    pos = 0
+    row = 0
+    i = 3
+    while i < len(image):
+        start = i
+        if image[0] == 8:
+            i += 1
+            rl = 0
+            while True:
+                op = image[i]
+                i += 1
+                rl += op
+                if op < 255:
+                    break
+        else:
+            op = image[i]
+            i += 1
+            rl = op & 0x3f
+            if rl == 0:
+                palette[next_color] = image[i]
+                mask |= 1 << (next_color - 1)
+                next_color = next_color + 1 if next_color < 3 else 1
+                i += 1
+                continue
+            if rl == 63:
+                while True:
+                    op = image[i]
+                    i += 1
+                    rl += op
+                    if op < 255:
+                        break
+
+        while row < sy and row * sx < pos + rl:
+            offset = start - 3 + header
+            skip = row * sx - pos
+            index += [offset & 0xff, offset >> 8, skip & 0xff, skip >> 8]
+            if image[0] == 8:
+                index += [0, 0, 0, 0]
+            else:
+                index += palette[1:] + [next_color | (mask << 2)]
+            row += interval
+        pos += rl
+
+    assert(len(index) == 8 * nentries)
+    return bytes([image[0] | 0x80, sx, sy, interval] + index) + image[3:]
 
 def render_c(image, fname):
     print(f'// 1-bit RLE, generated from {fname}, {len(image[2])} bytes')
@@ -325,6 +416,13 @@ parser.add_argument('--2bit', action='store_true', dest='twobit',
                     help='Generate 2-bit image')
 parser.add_argument('--8bit', action='store_true', dest='eightbit',
                     help='Generate 8-bit image')
+parser.add_argument('--index', default=0, type=int, metavar='ROWS',
+                    help='Add a row index, with an entry every ROWS rows, '
+                         'to a 2-bit or 8-bit image')
+parser.add_argument('--binary', action='store_true',
+                    help='Write a 2-bit or 8-bit image to a .rle file, ready '
+                         'to be copied to the watch, instead of generating '
+                         'code')
 
 args = parser.parse_args()
 extra_indent = ' ' * args.indent
@@ -338,10 +436,23 @@ else:
     encoder = encode
     depth =1
 
+if args.index:
+    if depth == 1:
+        parser.error('--index requires a 2-bit or 8-bit image')
+    if not 0 < args.index <= 255:
+        parser.error('--index must be between 1 and 255 rows')
+
 for fname in args.files:
     image = encoder(Image.open(fname))
+    if args.index:
+        image = add_index(image, args.index)
 
-    if args.c:
+    if args.binary:
+        if len(image) == 3:
+            parser.error('--binary requires a 2-bit or 8-bit image')
+        with open(os.path.splitext(fname)[0] + '.rle', 'wb') as f:
+            f.write(image)
+    elif args.c:
         render_c(image, fname)
     else:
         if len(image) == 3:
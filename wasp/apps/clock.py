@@ -35,6 +35,7 @@ class ClockApp():
 
     def __init__(self):
         self.meter = wasp.widgets.BatteryMeter()
+        self._always_on = False
 
     def foreground(self):
         """Activate the application."""
@@ -45,7 +46,23 @@ class ClockApp():
     def sleep(self):
         return True
 
+    def always_on(self):
+        """Prepare for the always-on display mode.
+
+        Only the time is visible whilst the display is in always-on mode so
+        the date and the battery meter are not updated until the watch wakes
+        up.
+
+        :returns: (y, height) tuple describing the band of the display to
+                  keep visible
+        """
+        self._always_on = True
+        return (80, 60)
+
     def wake(self):
+        if self._always_on:
+            self._always_on = False
+            self.on_screen = ( -1, -1, -1, -1, -1, -1 )
         self.update()
 
     def tick(self, ticks):
@@ -70,7 +87,8 @@ class ClockApp():
         now = wasp.watch.rtc.get_localtime()
         if now[3] == self.on_screen[3] and now[4] == self.on_screen[4]:
             if now[5] != self.on_screen[5]:
-                self.meter.update()
+                if not self._always_on:
+                    self.meter.update()
                 self.on_screen = now
             return False
 
@@ -80,6 +98,8 @@ class ClockApp():
         draw.rleblit(DIGITS[now[3]  % 10], pos=(1*48, 80))
         draw.rleblit(DIGITS[now[3] // 10], pos=(0*48, 80), fg=0xbdb6)
         self.on_screen = now
+        if self._always_on:
+            return True
 
         month = now[1] - 1
         month = MONTH[month*3:(month+1)*3]
@@ -6,6 +6,7 @@
 """
 
 import wasp
+import draw565
 import icons
 
 class LauncherApp():
@@ -16,6 +17,7 @@ class LauncherApp():
 
     def __init__(self):
         self._scroll = wasp.widgets.ScrollIndicator(y=6)
+        self._sprites = draw565.SpriteCache(wasp.watch.drawable)
 
     def foreground(self):
         """Activate the application."""
@@ -24,6 +26,10 @@ class LauncherApp():
         wasp.system.request_event(wasp.EventMask.TOUCH |
                                   wasp.EventMask.SWIPE_UPDOWN)
 
+    def background(self):
+        """De-activate the application."""
+        self._sprites.clear()
+
     def swipe(self, event):
         i = self._page
         n = self._num_pages
@@ -68,16 +74,25 @@ class LauncherApp():
         return page
 
     def _draw(self):
-        """Redraw the display from scratch."""
+        """Redraw the display from scratch.
+
+        The page is rendered in bands in order to compose the icons and
+        labels in RAM instead of overdrawing the background.
+        """
+        wasp.watch.drawable.render(self._draw_page)
+
+    def _draw_page(self):
+        """Draw the current page."""
         def draw_app(app, x, y):
             if not app:
                 return
-            draw.set_color(0xffff)
-            draw.blit(app.ICON if 'ICON' in dir(app) else icons.app, x+13, y+12)
+            sprites.blit(app.ICON if 'ICON' in dir(app) else icons.app,
+                         x+13, y+12)
             draw.set_color(0xbdb6)
             draw.string(app.NAME, x, y+120-30, 120)
 
         draw = wasp.watch.drawable
+        sprites = self._sprites
         page_num = self._page
         page = self._get_page(page_num)
         
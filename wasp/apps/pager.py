@@ -10,39 +10,65 @@ information when applications crash.
 """
 
 import wasp
+import fonts
 import icons
 
 import io
 import sys
 
+from micropython import const
+
+# The scrolling area holds 13 lines of text, three more than are visible,
+# leaving the remaining 8 lines of display RAM as a bottom fixed area.
+_LINE = const(24)
+_SCROLL_LINES = const(13 * _LINE)
+
 class PagerApp():
-    """Show a long text message in a pager."""
+    """Show a long text message in a pager.
+
+    By default the pager uses the hardware scrolling support of the
+    display to move between pages. Each newly exposed line of text is
+    drawn into display RAM that is not currently visible and is then
+    scrolled into view, so the page slides smoothly and only the new
+    lines are ever drawn.
+    """
     NAME = 'Pager'
     ICON = icons.app
 
-    def __init__(self, msg):
+    def __init__(self, msg, smooth=True):
+        """Prepare the pager.
+
+        :param str msg: Message to display
+        :param bool smooth: True to scroll smoothly between pages, False to
+                            redraw the whole page on every swipe.
+        """
         self._msg = msg
-        self._scroll = wasp.widgets.ScrollIndicator()
+        self._smooth = smooth
 
     def foreground(self):
         """Activate the application."""
         self._page = 0
-        self._chunks = wasp.watch.drawable.wrap(self._msg, 240)
-        self._numpages = (len(self._chunks) - 2) // 9
+        self._pages = [ 0, ]
+        self._top = 0
         wasp.system.request_event(wasp.EventMask.SWIPE_UPDOWN)
+        if self._smooth:
+            wasp.watch.display.scroll_area(0, _SCROLL_LINES)
         self._draw()
 
     def background(self):
         """De-activate the application."""
-        del self._chunks
-        del self._numpages
+        if self._smooth:
+            display = wasp.watch.display
+            display.scroll(0)
+            display.scroll_area()
+        del self._pages
 
     def swipe(self, event):
         """Swipe to page up/down."""
         mute = wasp.watch.display.mute
 
         if event[0] == wasp.EventType.UP:
-            if self._page >= self._numpages:
+            if not self._more:
                 wasp.system.navigate(wasp.EventType.BACK)
                 return
             self._page += 1
@@ -51,26 +77,93 @@ class PagerApp():
                 wasp.watch.vibrator.pulse()
                 return
             self._page -= 1
-        mute(True)
-        self._draw()
-        mute(False)
+
+        if self._smooth:
+            self._slide(event[0] == wasp.EventType.UP)
+        else:
+            mute(True)
+            self._draw()
+            mute(False)
+
+    def _lines(self):
+        """Wrap the current page.
+
+        Only the current page is wrapped. The start of each page is
+        remembered as it is reached so paging back and forth does not
+        require the message to be wrapped from the beginning.
+
+        :returns: List of the (up to ten) lines on the page
+        """
+        draw = wasp.watch.drawable
+        msg = self._msg
+        page = self._page
+        start = self._pages[page]
+        lines = []
+        for end in draw.wrap_iter(msg, 240, start):
+            lines.append(msg[start:end].rstrip())
+            start = end
+            if len(lines) == 9 and page + 1 == len(self._pages):
+                self._pages.append(start)
+            if len(lines) == 10:
+                break
+        self._more = start < len(msg)
+        return lines
 
     def _draw(self):
         """Draw the display from scratch."""
         draw = wasp.watch.drawable
+        if self._top:
+            self._top = 0
+            wasp.watch.display.scroll(0)
         draw.fill()
 
-        page = self._page
-        i = page * 9
-        j = i + 11
-        chunks = self._chunks[i:j]
-        for i in range(len(chunks)-1):
-            sub = self._msg[chunks[i]:chunks[i+1]].rstrip()
-            draw.string(sub, 0, 24*i)
-
-        scroll = self._scroll
-        scroll.up = page > 0
-        scroll.down = page < self._numpages
+        for i, line in enumerate(self._lines()):
+            draw.string(line, 0, _LINE*i)
+        self._draw_scroll()
+
+    def _draw_line(self, line, y):
+        """Draw a single line of text, clearing the rest of the line."""
+        draw = wasp.watch.drawable
+        draw.string(line, 0, y)
+        w = fonts.width(fonts.sans24, line) if line else 0
+        if w < 240:
+            draw.fill(0, w, y, 240 - w, _LINE)
+
+    def _slide(self, down):
+        """Scroll smoothly to the current page.
+
+        Adjacent pages overlap by a single line so nine lines must be
+        exposed. Each one is drawn just outside the visible part of the
+        scrolling area before the display is scrolled by one line.
+        """
+        display = wasp.watch.display
+        lines = self._lines()
+        lines += [''] * (10 - len(lines))
+        top = self._top
+
+        if down:
+            for line in lines[1:]:
+                self._draw_line(line, (top + 240) % _SCROLL_LINES)
+                top = (top + _LINE) % _SCROLL_LINES
+                display.scroll(top)
+
+            # The old scroll indicator has moved up to the top line
+            self._draw_line(lines[0], top)
+        else:
+            for line in reversed(lines[:9]):
+                top = (top - _LINE) % _SCROLL_LINES
+                self._draw_line(line, top)
+                display.scroll(top)
+
+        self._top = top
+        self._draw_scroll()
+
+    def _draw_scroll(self):
+        """Draw the scroll indicator at the bottom of the visible page."""
+        scroll = wasp.widgets.ScrollIndicator(
+                y=(self._top + 240 - _LINE) % _SCROLL_LINES)
+        scroll.up = self._page > 0
+        scroll.down = self._more
         scroll.draw()
 
 class CrashApp():
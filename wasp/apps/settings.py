@@ -16,16 +16,21 @@ class SettingsApp():
         self._slider = wasp.widgets.Slider(3, 10, 90)
 
     def foreground(self):
+        wasp.system.request_damage_tracking()
         self._draw()
         wasp.system.request_event(wasp.EventMask.TOUCH)
 
     def touch(self, event):
         self._slider.touch(event)
         wasp.system.brightness = self._slider.value + 1
-        self._update()
+        self._draw()
 
     def _draw(self):
-        """Redraw the display from scratch."""
+        """Redraw the display from scratch.
+
+        Damage tracking ensures only the parts of the display that have
+        changed will actually be redrawn.
+        """
         wasp.watch.drawable.fill()
         wasp.watch.drawable.string('Brightness', 0, 6, width=240)
         self._update()
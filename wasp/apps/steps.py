@@ -75,8 +75,5 @@ class StepCounterApp():
                 watch.accel.steps = 0
                 draw.fill(60, 132-18, 180, 36)
 
-        count = watch.accel.steps
-        t = str(count)
-        w = fonts.width(fonts.sans36, t)
         draw.set_font(fonts.sans36)
-        draw.string(t, 228-w, 132-18)
+        draw.number(watch.accel.steps, 228, 132-18, align='right')
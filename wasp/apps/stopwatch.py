@@ -89,6 +89,8 @@ class StopwatchApp():
         """Draw the display from scratch."""
         draw = wasp.watch.drawable
         draw.fill()
+        draw.set_font(fonts.sans36)
+        draw.string(':', 101, 120-36)
 
         self._last_count = -1
         self._update()
@@ -123,14 +125,11 @@ class StopwatchApp():
             minutes = secs // 60
             secs %= 60
 
-            t1 = '{}:{:02}'.format(minutes, secs)
-            t2 = '{:02}'.format(centisecs)
-
+            # The colon between the minutes and seconds is drawn by _draw()
             draw.set_font(fonts.sans36)
-            w = fonts.width(fonts.sans36, t1)
-            draw.string(t1, 180-w, 120-36)
-            draw.fill(0, 0, 120-36, 180-w, 36)
+            draw.number(minutes, 101, 120-36, align='right')
+            draw.number(secs, 180, 120-36, 2, 'right')
 
             draw.set_font(fonts.sans24)
-            draw.string(t2, 180, 120-36+18, width=46)
+            draw.number(centisecs, 187, 120-36+18, 2)
             self._last_count = self._count
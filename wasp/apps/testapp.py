@@ -16,7 +16,7 @@ class TestApp():
     ICON = icons.app
 
     def __init__(self):
-        self.tests = ('Button', 'Crash', 'Colours', 'RLE', 'String', 'Touch', 'Wrap')
+        self.tests = ('Button', 'Crash', 'Colours', 'Fill', 'RLE', 'String', 'Touch', 'Wrap')
         self.test = self.tests[0]
         self.scroll = wasp.widgets.ScrollIndicator()
 
@@ -68,6 +68,8 @@ class TestApp():
                 s.update()
                 self.scroll.draw()
                 self._update_colours()
+        elif self.test == 'Fill':
+            self._benchmark_fill()
         elif self.test == 'RLE':
             self._benchmark_rle()
         elif self.test == 'String':
@@ -78,6 +80,18 @@ class TestApp():
         elif self.test == 'Wrap':
             self._benchmark_wrap()
 
+    def _benchmark_fill(self):
+        draw = wasp.watch.drawable
+        t = machine.Timer(id=1, period=8000000)
+        t.start()
+        draw.fill(0x39e7)
+        elapsed = t.time()
+        t.stop()
+        del t
+        draw.string('{} test'.format(self.test), 0, 6, width=240)
+        self.scroll.draw()
+        draw.string('{}s'.format(elapsed / 1000000), 12, 24+192)
+
     def _benchmark_rle(self):
         draw = wasp.watch.drawable
         draw.fill(0, 0, 30, 240, 240-30)
@@ -7,12 +7,24 @@ import sys
 import sdl2
 import sdl2.ext
 
+SLPIN = 0x10
+SLPOUT = 0x11
+PTLON = 0x12
+NORON = 0x13
+DISPOFF = 0x28
+DISPON = 0x29
 CASET = 0x2a
 RASET = 0x2b
 RAMWR = 0x2c
+PTLAR = 0x30
+VSCRDEF = 0x33
+VSCSAD = 0x37
+IDMOFF = 0x38
+IDMON = 0x39
 
 WIDTH = 240
 HEIGHT = 240
+RAM_LINES = 320
 
 class ST7789Sim(object):
     def __init__(self):
@@ -23,6 +35,82 @@ class ST7789Sim(object):
         self.rowclip = [0, HEIGHT-1]
         self.cmd = 0
 
+        # The controller RAM is larger than the panel so keep a copy of
+        # it in order to emulate vertical scrolling.
+        self.ram = [[0] * WIDTH for y in range(RAM_LINES)]
+        self.scroll_area = [0, RAM_LINES, 0]
+        self.scroll_start = 0
+
+        # Line of RAM currently shown on each line of the panel
+        self.shown = list(range(HEIGHT))
+
+        self.sleeping = True
+        self.display_on = False
+        self.partial = None
+        self.partial_area = [0, HEIGHT-1]
+        self.idle = False
+
+    def power(self):
+        """Estimate the current drawn by the display, in microamps.
+
+        These are very rough figures (excluding the backlight) intended only
+        to compare the different power modes against each other.
+        """
+        if self.sleeping:
+            return 10
+        if not self.display_on:
+            return 3000
+        current = 6000
+        if self.idle:
+            current = 3500
+        if self.partial:
+            lines = self.partial_area[1] - self.partial_area[0] + 1
+            current = 1000 + (current - 1000) * lines // HEIGHT
+        return current
+
+    def report_power(self):
+        print(f'DISPLAY: ~{self.power()} uA')
+
+    def shade(self, line, pixel):
+        """Apply the effect of partial and idle modes to a pixel."""
+        if self.partial and not \
+                self.partial_area[0] <= line <= self.partial_area[1]:
+            return 0
+        if self.idle:
+            # Only the most significant bit of each channel is shown
+            pixel = ((0xff0000 if pixel & 0x800000 else 0) +
+                     (0x00ff00 if pixel & 0x008000 else 0) +
+                     (0x0000ff if pixel & 0x000080 else 0))
+        return pixel
+
+    def panel_line(self, line):
+        """Find where a line of display RAM appears on the panel."""
+        top, height, bottom = self.scroll_area
+        if top <= line < top + height:
+            line = top + (line - self.scroll_start) % height
+        return line
+
+    def refresh(self, full=False):
+        """Redraw the panel from the display RAM.
+
+        Only the lines of the panel that now show a different line of RAM,
+        with different contents, are redrawn unless full is set (which is
+        needed when the shading of the panel changes).
+        """
+        pixelview = sdl2.ext.pixels2d(windowsurface)
+        shown = self.shown
+        for y in range(RAM_LINES):
+            line = self.panel_line(y)
+            if line >= HEIGHT or shown[line] == y and not full:
+                continue
+            row = self.ram[y]
+            if full or row != self.ram[shown[line]]:
+                for x in range(WIDTH):
+                    pixelview[x][line] = self.shade(line, row[x])
+            shown[line] = y
+        del pixelview
+        window.refresh()
+
     def write(self, data):
         if len(data) == 1:
             # Assume if we get a byte at a time then it is command.
@@ -30,6 +118,30 @@ class ST7789Sim(object):
             # the D/C pin from within the simulator.
             self.cmd = data[0]
 
+            # RAMWR always starts from the top-left of the window
+            if self.cmd == RAMWR:
+                self.x = self.colclip[0]
+                self.y = self.rowclip[0]
+
+            elif self.cmd in (SLPIN, SLPOUT):
+                self.sleeping = self.cmd == SLPIN
+                self.report_power()
+            elif self.cmd in (DISPOFF, DISPON):
+                self.display_on = self.cmd == DISPON
+                self.report_power()
+            elif self.cmd in (PTLON, NORON):
+                self.partial = self.cmd == PTLON
+                self.report_power()
+                self.refresh(True)
+            elif self.cmd in (IDMON, IDMOFF):
+                self.idle = self.cmd == IDMON
+                self.report_power()
+                self.refresh(True)
+
+        elif self.cmd == PTLAR:
+            self.partial_area[0] = (data[0] << 8) + data[1]
+            self.partial_area[1] = (data[2] << 8) + data[3]
+
         elif self.cmd == CASET:
             self.colclip[0] = (data[0] << 8) + data[1]
             self.colclip[1] = (data[2] << 8) + data[3]
@@ -40,6 +152,16 @@ class ST7789Sim(object):
             self.rowclip[1] = (data[2] << 8) + data[3]
             self.y = self.rowclip[0]
 
+        elif self.cmd == VSCRDEF:
+            self.scroll_area = [(data[0] << 8) + data[1],
+                                (data[2] << 8) + data[3],
+                                (data[4] << 8) + data[5]]
+            self.refresh()
+
+        elif self.cmd == VSCSAD:
+            self.scroll_start = (data[0] << 8) + data[1]
+            self.refresh()
+
         elif self.cmd == RAMWR:
             #pixelview = sdl2.ext.PixelView(windowsurface)
             pixelview = sdl2.ext.pixels2d(windowsurface)
@@ -59,8 +181,11 @@ class ST7789Sim(object):
                 pixel = (((rgb & 0xf800) << 8) +
                          ((rgb & 0x07e0) << 5) +
                          ((rgb & 0x001f) << 3))
-            
-                pixelview[self.x][self.y] = pixel
+
+                self.ram[self.y][self.x] = pixel
+                line = self.panel_line(self.y)
+                if line < HEIGHT:
+                    pixelview[self.x][line] = self.shade(line, pixel)
 
                 self.x += 1
                 if self.x > self.colclip[1]:
@@ -60,6 +60,13 @@ class PWM(Tracer):
     FREQ_16MHZ = 'FREQ_16MHZ'
 
 class SPI(object):
+    """Simulated SPI controller.
+
+    The controller counts how many freshly allocated buffers are written to
+    it (a buffer is fresh if it has not been seen recently). This makes it
+    easy to check whether a drawing path is allocation free: reset
+    ``allocations`` to zero, draw something and check it is still zero.
+    """
     def __init__(self, id):
         self._id = id
         if id == 0:
@@ -67,10 +74,28 @@ class SPI(object):
         else:
             self.sim = None
 
+        self.allocations = 0
+        self._seen = {}
+
+    def _track(self, buf):
+        # Keep recently written buffers alive so that their ids cannot be
+        # recycled by new allocations
+        if isinstance(buf, memoryview):
+            buf = buf.obj
+        key = id(buf)
+        if key in self._seen:
+            del self._seen[key]
+        else:
+            self.allocations += 1
+            if len(self._seen) >= 256:
+                del self._seen[next(iter(self._seen))]
+        self._seen[key] = buf
+
     def init(self, baudrate=1000000,  polarity=0, phase=0, bits=8, sck=None, mosi=None, miso=None):
         pass
 
     def write(self, buf):
+        self._track(buf)
         if self.sim:
             self.sim.write(buf)
         else:
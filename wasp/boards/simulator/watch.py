@@ -5,6 +5,18 @@ import time
 def sleep_ms(ms):
     time.sleep(ms / 1000)
 time.sleep_ms = sleep_ms
+def ticks_us():
+    return int(time.monotonic() * 1000000)
+time.ticks_us = ticks_us
+def ticks_diff(a, b):
+    return a - b
+time.ticks_diff = ticks_diff
+def ticks_ms():
+    return int(time.monotonic() * 1000)
+time.ticks_ms = ticks_ms
+def ticks_add(a, b):
+    return a + b
+time.ticks_add = ticks_add
 
 import sys, traceback
 def print_exception(exc, file=sys.stdout):
@@ -125,7 +137,7 @@ spi.init(polarity=1, phase=1, baudrate=8000000)
 display = ST7789_SPI(240, 240, spi,
         cs=Pin("DISP_CS", Pin.OUT, quiet=True),
         dc=Pin("DISP_DC", Pin.OUT, quiet=True),
-        res=Pin("DISP_RST", Pin.OUT, quiet=True))
+        res=Pin("DISP_RST", Pin.OUT, quiet=True), lines=8)
 drawable = draw565.Draw565(display)
 
 accel = Accelerometer()
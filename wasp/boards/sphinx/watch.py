@@ -45,6 +45,18 @@ import time
 def sleep_ms(ms):
     time.sleep(ms / 1000)
 time.sleep_ms = sleep_ms
+def ticks_us():
+    return int(time.monotonic() * 1000000)
+time.ticks_us = ticks_us
+def ticks_diff(a, b):
+    return a - b
+time.ticks_diff = ticks_diff
+def ticks_ms():
+    return int(time.monotonic() * 1000)
+time.ticks_ms = ticks_ms
+def ticks_add(a, b):
+    return a + b
+time.ticks_add = ticks_add
 
 class Pin():
     def value(v=None):
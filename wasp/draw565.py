@@ -7,32 +7,97 @@
 
 import array
 import fonts.sans24
+import math
 import micropython
+import os
+import time
+
+from drivers.st7789 import _fill
+from micropython import const
+
+# Primitives recorded by the damage tracker
+_FILL = const(0)
+_BLIT = const(1)
+_RLEBLIT = const(2)
+_STRING = const(3)
+_REGION = const(4)
+_NUMBER = const(5)
+
+# Size of the buffer used to read images from files
+_READ_SIZE = const(128)
+
+# Digit glyphs for each font that has been used to draw a number
+_digits = {}
 
 @micropython.viper
-def _bitblit(bitbuf, pixels, bgfg: int, count: int):
-    mv = ptr16(bitbuf)
-    px = ptr8(pixels)
+def _expand_lut(lut, bgfg: int):
+    """Populate a monochrome expansion table.
+
+    The table holds an 8 pixel block of (byte-swapped) RGB565 pixels for every
+    possible byte of 1-bit source data. It is 4KB in size.
+    """
+    p = ptr16(lut)
 
     # Extract and byte-swap
     bg = ((bgfg >> 24) & 0xff) + ((bgfg >> 8) & 0xff00)
     fg = ((bgfg >>  8) & 0xff) + ((bgfg & 0xff) << 8)
 
-    bitselect = 0x80
+    for i in range(256):
+        bitselect = 0x80
+        base = i << 3
+        for bit in range(8):
+            p[base + bit] = fg if i & bitselect else bg
+            bitselect >>= 1
+
+@micropython.viper
+def _bitblit(bitbuf, pixels, lut, count: int):
+    mv = ptr16(bitbuf)
+    px = ptr8(pixels)
+    lt = ptr16(lut)
+
     pxp = 0
     mvp = 0
 
-    for bit in range(count):
-        # Draw the pixel
-        active = px[pxp] & bitselect
-        mv[mvp] = fg if active else bg
-        mvp += 1
+    # Expand a byte (eight pixels) at a time
+    for i in range(count >> 3):
+        sp = px[pxp] << 3
+        mv[mvp  ] = lt[sp  ]
+        mv[mvp+1] = lt[sp+1]
+        mv[mvp+2] = lt[sp+2]
+        mv[mvp+3] = lt[sp+3]
+        mv[mvp+4] = lt[sp+4]
+        mv[mvp+5] = lt[sp+5]
+        mv[mvp+6] = lt[sp+6]
+        mv[mvp+7] = lt[sp+7]
+        mvp += 8
+        pxp += 1
 
-        # Advance to the next bit
-        bitselect >>= 1
-        if not bitselect:
-            bitselect = 0x80
-            pxp += 1
+    # Handle any trailing pixels
+    if count & 7:
+        sp = px[pxp] << 3
+        for bit in range(count & 7):
+            mv[mvp+bit] = lt[sp+bit]
+
+@micropython.viper
+def _span1bit(bits, start: int, count: int, value: int):
+    """Set (or clear) a run of bits, most significant bit first."""
+    p = ptr8(bits)
+    i = start
+    end = start + count
+
+    # Work a bit at a time until we reach a byte boundary and then a byte
+    # at a time until there are less than eight bits left
+    while i < end:
+        if (i & 7) == 0 and i + 8 <= end:
+            p[i >> 3] = 0xff if value else 0
+            i += 8
+            continue
+        m = 0x80 >> (i & 7)
+        if value:
+            p[i >> 3] = p[i >> 3] | m
+        else:
+            p[i >> 3] = p[i >> 3] & (0xff ^ m)
+        i += 1
 
 @micropython.viper
 def _clut8_rgb565(i: int) -> int:
@@ -55,35 +120,994 @@ def _clut8_rgb565(i: int) -> int:
 
     return rgb565
 
+_clut8 = None
+
+def _clut8_table():
+    """Get the CLUT8 palette as a table of (byte-swapped) RGB565 pixels.
+
+    The table is shared by all palette based image formats. It is built the
+    first time it is needed and occupies 512 bytes.
+    """
+    global _clut8
+    if not _clut8:
+        _clut8 = array.array('H', bytes(512))
+        for i in range(256):
+            rgb565 = _clut8_rgb565(i)
+            _clut8[i] = (rgb565 >> 8) + ((rgb565 & 0xff) << 8)
+    return _clut8
+
 @micropython.viper
-def _fill(mv, color: int, count: int, offset: int):
+def _fill_swapped(mv, color: int, count: int, offset: int):
+    """Fill a buffer with an RGB565 pixel that is already byte-swapped."""
     p = ptr16(mv)
-    color = (color >> 8) + ((color & 0xff) << 8)
-
     for x in range(offset, offset+count):
         p[x] = color
 
-def _bounding_box(s, font):
-    w = 0
-    for ch in s:
-        (_, h, wc) = font.get_ch(ch)
-        w += wc + 1
+def _is_file(image):
+    """Check whether an image is a file (or a path) rather than data in RAM."""
+    return isinstance(image, str) or hasattr(image, 'readinto')
+
+@micropython.viper
+def _hash(data, h: int) -> int:
+    """Update a 28-bit FNV-1a hash with the contents of a buffer."""
+    p = ptr8(data)
+    for i in range(int(len(data))):
+        h = ((h ^ p[i]) * 16777619) & 0xfffffff
+    return h
+
+@micropython.viper
+def _aablit(pixels, src, blend, count: int):
+    """Expand a row of anti-aliased pixels using a blend table.
+
+    The depth of the source pixels is implied by the size of the blend
+    table; a four entry table means 2-bit pixels and a sixteen entry table
+    means 4-bit pixels.
+    """
+    dp = ptr16(pixels)
+    sp = ptr8(src)
+    lut = ptr16(blend)
+
+    if int(len(blend)) == 4:
+        for x in range(count):
+            dp[x] = lut[(sp[x >> 2] >> (6 - ((x & 3) << 1))) & 3]
+    else:
+        for x in range(count):
+            dp[x] = lut[(sp[x >> 1] >> (4 - ((x & 1) << 2))) & 15]
 
-    return (w, h)
+@micropython.viper
+def _digit_rows(pixels, src, table, geom):
+    """Expand rows of a glyph into a buffer, centred within a wider cell.
+
+    :param geom: array('H') holding the width of the glyph, the width of
+                 the cell, the first row to expand, the number of rows to
+                 expand and the depth of the glyph
+    """
+    dp = ptr16(pixels)
+    sp = ptr8(src)
+    lut = ptr16(table)
+    g = ptr16(geom)
+    w = g[0]
+    cw = g[1]
+    bpp = g[4]
+    bg = lut[0]
+    pad = (cw - 1 - w) >> 1
+    stride = (w * bpp + 7) >> 3
+
+    dst = 0
+    for row in range(g[2], g[2] + g[3]):
+        s = row * stride
+        for x in range(cw):
+            dp[dst + x] = bg
+        for x in range(w):
+            if bpp == 1:
+                v = lut[(sp[s + (x >> 3)] << 3) + (x & 7)]
+            elif bpp == 2:
+                v = lut[(sp[s + (x >> 2)] >> (6 - ((x & 3) << 1))) & 3]
+            else:
+                v = lut[(sp[s + (x >> 1)] >> (4 - ((x & 1) << 2))) & 15]
+            dp[dst + pad + x] = v
+        dst += cw
+
+def _digit_table(font):
+    """Get the glyphs for the digits of a font.
+
+    The table is built the first time a font is used to draw a number and
+    is then shared by all subsequent callers.
+
+    :returns: (glyphs, width, bpp) tuple where width is the width of the
+              widest digit (plus the single pixel gap between characters)
+              and bpp is the depth of the font
+    """
+    table = _digits.get(font)
+    if not table:
+        glyphs = tuple(font.get_ch(ch) for ch in '0123456789')
+        bpp = font.bpp() if hasattr(font, 'bpp') else 1
+        table = (glyphs, max(g[2] for g in glyphs) + 1, bpp)
+        _digits[font] = table
+    return table
+
+def _blend_table(bgfg, bpp):
+    """Calculate the (byte-swapped) RGB565 colour of each coverage level.
+
+    :returns: array('H') with an entry for every possible pixel value
+    """
+    bg = bgfg >> 16
+    fg = bgfg & 0xffff
+    n = (1 << bpp) - 1
+    blend = array.array('H', bytes(2 << bpp))
+    for i in range(n + 1):
+        rgb = 0
+        for mask in (0xf800, 0x07e0, 0x001f):
+            b = bg & mask
+            rgb += (b + (((fg & mask) - b) * i) // n) & mask
+        blend[i] = (rgb >> 8) + ((rgb & 0xff) << 8)
+    return blend
 
 @micropython.native
-def _draw_glyph(display, glyph, x, y, bgfg):
-    (px, h, w) = glyph
+def _render_glyph(glyph, lut, bpp=1):
+    """Expand a glyph into a buffer of (byte-swapped) RGB565 pixels.
+
+    The rendered glyph includes the single pixel gap that separates it from
+    the next character so the result can be sent to the display in a single
+    write. The pixels are returned as a memoryview so that rows can be
+    sliced out of them without being copied.
 
-    buf = memoryview(display.linebuffer)[0:2*(w+1)]
-    buf[2*w] = 0
-    buf[2*w + 1] = 0
-    bytes_per_row = (w + 7) // 8
+    :param lut: Monochrome expansion table or, for anti-aliased fonts, the
+                blend table
+    :param bpp: Bits per pixel of the glyph
+    """
+    (px, h, w) = glyph
+    stride = 2 * (w+1)
+    pixels = bytearray(stride * h)
+    mv = memoryview(pixels)
+    bytes_per_row = (w * bpp + 7) // 8
 
-    display.set_window(x, y, w+1, h)
     for row in range(h):
-        _bitblit(buf, px[row*bytes_per_row:], bgfg, w)
-        display.write_data(buf)
+        if bpp == 1:
+            _bitblit(mv[row*stride:], px[row*bytes_per_row:], lut, w)
+        else:
+            _aablit(mv[row*stride:], px[row*bytes_per_row:], lut, w)
+
+    return (mv, h, w)
+
+def _overlaps(a, b):
+    """Check whether two (x, y, w, h) rectangles overlap."""
+    return (a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and
+            a[1] < b[1] + b[3] and b[1] < a[1] + a[3])
+
+def _covers(a, b):
+    """Check whether rectangle a completely covers rectangle b."""
+    return (a[0] <= b[0] and a[1] <= b[1] and
+            a[0] + a[2] >= b[0] + b[2] and a[1] + a[3] >= b[1] + b[3])
+
+def _intersect(a, b):
+    """Find the overlap of two rectangles (or None if they do not overlap)."""
+    x = max(a[0], b[0])
+    y = max(a[1], b[1])
+    w = min(a[0] + a[2], b[0] + b[2]) - x
+    h = min(a[1] + a[3], b[1] + b[3]) - y
+    if w <= 0 or h <= 0:
+        return None
+    return (x, y, w, h)
+
+def _subtract(a, b):
+    """Split rectangle a into the pieces that are not covered by b."""
+    r = _intersect(a, b)
+    if not r:
+        return [a]
+    (x, y, w, h) = a
+    (ix, iy, iw, ih) = r
+    pieces = []
+    if iy > y:
+        pieces.append((x, y, w, iy - y))
+    if iy + ih < y + h:
+        pieces.append((x, iy + ih, w, y + h - iy - ih))
+    if ix > x:
+        pieces.append((x, iy, ix - x, ih))
+    if ix + iw < x + w:
+        pieces.append((ix + iw, iy, x + w - ix - iw, ih))
+    return pieces
+
+def _merge(rects, rect):
+    """Add a rectangle to a list, merging it with any that it overlaps."""
+    i = 0
+    while i < len(rects):
+        r = rects[i]
+        if _overlaps(r, rect):
+            x = min(r[0], rect[0])
+            y = min(r[1], rect[1])
+            rect = (x, y, max(r[0] + r[2], rect[0] + rect[2]) - x,
+                          max(r[1] + r[3], rect[1] + rect[3]) - y)
+            del rects[i]
+            i = 0
+        else:
+            i += 1
+    rects.append(rect)
+
+def _damage(ops, others, damage):
+    """Damage the rectangle of every record in ops that is not in others.
+
+    The records are indexed by everything except their arguments, which
+    may be unhashable (images can be held in a bytearray), so the
+    arguments are only compared with those of records in the same place.
+    """
+    index = {}
+    for rec in others:
+        key = (rec[0], rec[1], rec[3], rec[4])
+        group = index.get(key)
+        if group:
+            group.append(rec)
+        else:
+            index[key] = [rec]
+    for rec in ops:
+        if rec not in index.get((rec[0], rec[1], rec[3], rec[4]), ()):
+            _merge(damage, rec[1])
+
+def _sort(ops):
+    """Sort recorded primitives from top-to-bottom and left-to-right.
+
+    Primitives that overlap are never reordered with respect to each other
+    so sorting does not change what ends up on the display.
+    """
+    out = []
+    for rec in ops:
+        rect = rec[1]
+        i = len(out)
+        while i:
+            r = out[i-1][1]
+            if (r[1], r[0]) <= (rect[1], rect[0]) or _overlaps(r, rect):
+                break
+            i -= 1
+        out.insert(i, rec)
+    return out
+
+def _coalesce(ops):
+    """Combine adjacent fills and drop primitives that will be overdrawn.
+
+    Consecutive fills of the same colour that together form a rectangle are
+    replaced by a single fill.
+    """
+    out = []
+    for i in range(len(ops)):
+        rec = ops[i]
+        (op, b, args, bgfg, font) = rec
+        if any(_covers(o[1], b) for o in ops[i+1:]):
+            continue
+        if out and op == _FILL and out[-1][0] == _FILL and \
+                out[-1][2][0] == args[0]:
+            a = out[-1][1]
+            r = None
+            if a[1] == b[1] and a[3] == b[3] and a[0] + a[2] == b[0]:
+                r = (a[0], a[1], a[2] + b[2], a[3])
+            elif a[0] == b[0] and a[2] == b[2] and a[1] + a[3] == b[1]:
+                r = (a[0], a[1], a[2], a[3] + b[3])
+            if r:
+                out[-1] = (_FILL, r, (args[0],) + r, bgfg, font)
+                continue
+        out.append(rec)
+    return out
+
+class GlyphCache(object):
+    """Least recently used cache of rendered glyphs.
+
+    Rendered glyphs are stored as ready-to-send RGB565 pixels, keyed by the
+    font, the character and the colours used to render it. The cache is
+    bounded by a byte budget (which covers only the pixel data) and will
+    evict the least recently used glyphs to stay within it. The default
+    budget holds a short string in the 24pt font. Numbers drawn using
+    :py:meth:`Draw565.number` do not use the cache.
+
+    .. data:: budget
+
+        Maximum number of bytes of pixel data to hold in the cache. Set to
+        zero to disable caching.
+
+    .. data:: hits
+
+        Number of glyphs that were found in the cache.
+
+    .. data:: misses
+
+        Number of glyphs that had to be rendered from the font.
+    """
+    def __init__(self, budget=4096):
+        self.budget = budget
+        self.clear()
+
+    def clear(self):
+        """Discard all cached glyphs and reset the statistics."""
+        self._glyphs = {}
+        self._lru = []
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, font, ch, bgfg):
+        """Lookup a rendered glyph.
+
+        :returns: A (pixels, height, width) tuple or None if the glyph is not
+                  in the cache.
+        """
+        key = (font, ch, bgfg)
+        glyph = self._glyphs.get(key)
+        if glyph:
+            self.hits += 1
+            lru = self._lru
+            if lru[-1] != key:
+                lru.remove(key)
+                lru.append(key)
+        else:
+            self.misses += 1
+        return glyph
+
+    def put(self, font, ch, bgfg, glyph):
+        """Add a rendered glyph to the cache.
+
+        Glyphs that are larger than the budget are silently ignored.
+        """
+        sz = len(glyph[0])
+        if sz > self.budget:
+            return
+
+        glyphs = self._glyphs
+        lru = self._lru
+        while self.used + sz > self.budget:
+            self.used -= len(glyphs.pop(lru.pop(0))[0])
+
+        key = (font, ch, bgfg)
+        glyphs[key] = glyph
+        lru.append(key)
+        self.used += sz
+
+class _Spans(object):
+    """Batch horizontal spans into filled rectangles.
+
+    Spans must be added one row at a time from top to bottom. Spans with
+    the same horizontal extent on consecutive rows are drawn using a single
+    fill (and therefore a single window).
+    """
+    def __init__(self, draw, color):
+        self._draw = draw
+        self._color = color
+        self._open = {}
+        self._y = 0
+
+    def row(self, y, spans):
+        """Add the spans for a row.
+
+        :param y: Y coordinate of the row
+        :param spans: List of (x0, x1) tuples, with x1 inclusive
+        """
+        opened = self._open
+        self._open = {}
+        for span in spans:
+            if span[1] >= span[0]:
+                self._open[span] = opened.pop(span, y)
+        for (span, top) in opened.items():
+            self._fill(span, top, y - top)
+        self._y = y
+
+    def close(self):
+        """Draw any spans that are still open."""
+        for (span, top) in self._open.items():
+            self._fill(span, top, self._y + 1 - top)
+        self._open = {}
+
+    def _fill(self, span, y, h):
+        display = self._draw._display
+        x0 = max(span[0], 0)
+        x1 = min(span[1], display.width - 1)
+        if y < 0:
+            h += y
+            y = 0
+        h = min(h, display.height - y)
+        if x1 >= x0 and h > 0:
+            self._draw.fill(self._color, x0, y, x1 - x0 + 1, h)
+
+class _Band(object):
+    """Off-screen strip of RGB565 pixels.
+
+    The band implements enough of the display driver interface that the
+    drawing primitives can rasterise into it rather than into the display.
+    Anything drawn outside the band is discarded.
+    """
+    def __init__(self, display, rows, width=None):
+        if not width:
+            width = display.width
+        self.width = width
+        self.height = display.height
+        self.linebuffer = display.linebuffer
+        self.rows = rows
+        self.y = 0
+        self.buf = bytearray(2 * width * rows)
+        self.set_window()
+
+    def buffer_rows(self, width):
+        return len(self.linebuffer) // (2 * width)
+
+    def set_window(self, x=0, y=0, width=None, height=None):
+        if not width:
+            width = self.width
+        if not height:
+            height = self.height
+
+        self._x0 = x
+        self._x1 = min(x + width, self.width)
+        self._cx = x
+        self._cy = y
+
+    def write_data(self, buf):
+        x0 = self._x0
+        x1 = self._x1
+        cx = self._cx
+        cy = self._cy
+        top = self.y
+        bottom = top + self.rows
+        width = self.width
+        pixels = self.buf
+        sz = len(buf)
+        bp = 0
+
+        while bp < sz and cy < bottom:
+            count = min(2 * (x1 - cx), sz - bp)
+            if cy >= top:
+                dp = 2 * ((cy - top) * width + cx)
+                pixels[dp:dp+count] = buf[bp:bp+count]
+            bp += count
+            cx += count // 2
+            if cx >= x1:
+                cx = x0
+                cy += 1
+
+        self._cx = cx
+        self._cy = cy
+
+    def quick_start(self):
+        pass
+
+    def quick_end(self):
+        pass
+
+    quick_write = write_data
+
+    def rawblit(self, buf, x, y, width, height):
+        self.set_window(x, y, width, height)
+        self.write_data(buf)
+
+    def fill(self, bg, x=0, y=0, w=None, h=None):
+        if not w:
+            w = self.width - x
+        if not h:
+            h = self.height - y
+
+        top = max(y, self.y)
+        bottom = min(y + h, self.y + self.rows)
+        w = min(w, self.width - x)
+        for row in range(top - self.y, bottom - self.y):
+            _fill(self.buf, bg, w, row * self.width + x)
+
+class SpriteCache(object):
+    """Cache of decoded images.
+
+    Images are decoded once into raw RGB565 pixels and stored in the
+    filesystem, keyed by the contents of the image and the colours used to
+    draw it. Later blits stream the raw pixels from the filesystem to the
+    display without decoding the image again. A small RAM cache holds the
+    most frequently used sprites that are small enough to fit in its budget.
+    A sprite only displaces others from RAM if it has been drawn more often
+    than each of the sprites it would evict, so drawing several sprites in
+    turn (such as a page of launcher icons) does not flush the cache.
+
+    At most :py:data:`files` decoded images are kept in the filesystem.
+    When a new image is decoded the least recently used ones are deleted,
+    starting with any left behind by earlier runs.
+
+    Applications should call :py:meth:`~.clear` from their ``background()``
+    method so that the RAM cache is not held while they are not running.
+
+    If the filesystem is not available then images are decoded and drawn
+    in the normal way.
+
+    Sprites are drawn immediately, even if damage tracking is enabled, but
+    they can be used by a draw function passed to
+    :py:meth:`Draw565.render`.
+
+    .. data:: budget
+
+        Maximum number of bytes of pixel data to keep in RAM.
+
+    .. data:: files
+
+        Maximum number of decoded images to keep in the filesystem.
+
+    .. data:: hits
+
+        Number of sprites drawn from RAM.
+
+    .. data:: misses
+
+        Number of sprites that had to be read from the filesystem (or
+        decoded).
+    """
+    def __init__(self, draw, path='/flash/sprites', budget=12288, files=16):
+        """Create a sprite cache.
+
+        The default budget is large enough to hold one 96x64 launcher icon.
+
+        :param Draw565 draw: Drawing library used to decode the images
+        :param str path:     Directory used to store decoded images
+        :param int budget:   Size of the RAM cache, in bytes
+        :param int files:    Number of decoded images to keep in the
+                             filesystem
+        """
+        self._draw = draw
+        self._path = path
+        self.budget = budget
+        self.files = files
+        self._sprites = {}
+        self._lru = []
+        self._counts = {}
+        self._files = []
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def blit(self, image, x, y, fg=0xffff, c1=0x4a69, c2=0x7bef):
+        """Draw an encoded image.
+
+        The arguments are the same as for :py:meth:`Draw565.blit`.
+        """
+        draw = self._draw
+        if len(image) == 3:
+            (sx, sy) = image[0:2]
+        else:
+            (sx, sy) = image[1:3]
+
+        # Work out which rows are visible (there is no point reading rows
+        # that fall outside the current band when rendering in bands)
+        display = draw._display
+        top = y
+        bottom = y + sy
+        if isinstance(display, _Band):
+            top = max(top, display.y)
+            bottom = min(bottom, display.y + display.rows)
+        clip = draw._clip
+        if clip:
+            if x < clip[0] or x + sx > clip[0] + clip[2]:
+                # The raw pixels cannot be cropped horizontally
+                draw.blit(image, x, y, fg, c1, c2)
+                return
+            top = max(top, clip[1])
+            bottom = min(bottom, clip[1] + clip[3])
+        if top >= bottom:
+            return
+        skip = 2 * sx * (top - y)
+        size = 2 * sx * (bottom - top)
+
+        key = (id(image), fg, c1, c2)
+        count = self._counts.get(key, 0) + 1
+        self._counts[key] = count
+        sprite = self._sprites.get(key)
+        if sprite:
+            self.hits += 1
+            lru = self._lru
+            if lru[-1] != key:
+                lru.remove(key)
+                lru.append(key)
+            display.rawblit(memoryview(sprite)[skip:skip+size],
+                            x, top, sx, bottom - top)
+            return
+        self.misses += 1
+
+        try:
+            f = self._open(image, sx, sy, fg, c1, c2)
+        except OSError:
+            draw.blit(image, x, y, fg, c1, c2)
+            return
+
+        with f:
+            if self._admit(count, 2 * sx * sy):
+                try:
+                    sprite = f.read()
+                except MemoryError:
+                    # The heap is too fragmented to hold the sprite so
+                    # stream it instead
+                    sprite = None
+                if sprite:
+                    self._put(key, sprite)
+                    display.rawblit(memoryview(sprite)[skip:skip+size],
+                                    x, top, sx, bottom - top)
+                    return
+
+            buf = memoryview(display.linebuffer)
+            f.seek(skip)
+            display.set_window(x, top, sx, bottom - top)
+            while size:
+                n = f.readinto(buf[0:min(size, len(buf))])
+                if not n:
+                    break
+                display.write_data(buf[0:n])
+                size -= n
+
+    def clear(self):
+        """Release the RAM cache.
+
+        Decoded images are kept in the filesystem so sprites that are drawn
+        again later are streamed from there without decoding them again.
+        """
+        self._sprites.clear()
+        self._lru = []
+        self.used = 0
+
+    def _open(self, image, sx, sy, fg, c1, c2):
+        """Open the decoded image, decoding it first if needed."""
+        if len(image) == 3:
+            h = _hash(image[2], (sx << 8) + sy)
+        else:
+            h = _hash(image, 0)
+        name = '{:07x}-{:04x}{:04x}{:04x}'.format(h, fg, c1, c2)
+        fname = self._path + '/' + name
+
+        files = self._files
+        if name in files:
+            files.remove(name)
+        try:
+            f = open(fname, 'rb')
+            files.append(name)
+            return f
+        except OSError:
+            pass
+
+        try:
+            os.mkdir(self._path)
+        except OSError:
+            self._trim()
+
+        # Decode the image a few rows at a time (to avoid needing enough RAM
+        # to hold the whole sprite)
+        draw = self._draw
+        display = draw._display
+        rows = 8
+        band = _Band(display, rows, sx)
+        ops = draw._ops
+        (clip, clips) = (draw._clip, draw._clips)
+        draw._ops = None
+        draw._clip = None
+        draw._clips = []
+        draw._display = band
+        try:
+            with open(fname + '.tmp', 'wb') as f:
+                for y in range(0, sy, rows):
+                    band.y = y
+                    draw.blit(image, 0, 0, fg, c1, c2)
+                    f.write(memoryview(band.buf)[0:2*sx*min(rows, sy-y)])
+        finally:
+            draw._display = display
+            draw._clip = clip
+            draw._clips = clips
+            draw._ops = ops
+        os.rename(fname + '.tmp', fname)
+        files.append(name)
+
+        return open(fname, 'rb')
+
+    def _trim(self):
+        """Delete decoded images to make room for a new one."""
+        path = self._path
+        files = self._files
+        names = [n for n in os.listdir(path) if n not in files]
+        names.extend(files)
+        for name in names[0:len(names) - self.files + 1]:
+            try:
+                os.remove(path + '/' + name)
+            except OSError:
+                pass
+            if name in files:
+                files.remove(name)
+
+    def _admit(self, count, size):
+        """Check whether a sprite drawn count times may be kept in RAM."""
+        if size > self.budget:
+            return False
+        counts = self._counts
+        sprites = self._sprites
+        free = self.budget - self.used
+        for key in self._lru:
+            if free >= size:
+                break
+            if counts[key] >= count:
+                return False
+            free += len(sprites[key])
+        return True
+
+    def _put(self, key, sprite):
+        """Add a sprite to the RAM cache."""
+        sprites = self._sprites
+        lru = self._lru
+        while self.used + len(sprite) > self.budget:
+            self.used -= len(sprites.pop(lru.pop(0)))
+        sprites[key] = sprite
+        lru.append(key)
+        self.used += len(sprite)
+
+class Canvas(object):
+    """Off-screen monochrome bitmap.
+
+    The canvas holds one bit per pixel, packed most significant bit first,
+    so even a full 240x240 canvas needs only 7.2KB of RAM. Drawing on the
+    canvas only touches RAM. Rows that have changed are remembered and
+    :py:meth:`~.flush` expands just those rows into RGB565, using the
+    current colours of the drawing library, and streams them to the
+    display.
+
+    Anything drawn outside the canvas is discarded.
+
+    The canvas is drawn directly to the display, even if damage tracking
+    is enabled, but is clipped to the current clip rectangle.
+
+    .. data:: bits
+
+        The packed pixels. Each row of the canvas starts on a byte boundary.
+
+    .. automethod:: __init__
+    """
+    def __init__(self, draw, width=240, height=240):
+        """Create a blank canvas.
+
+        Every row of a new canvas is marked as changed, so the first
+        :py:meth:`~.flush` draws the whole canvas.
+
+        :param draw:   The :py:class:`.Draw565` the canvas is flushed to
+        :param width:  Width of the canvas, in pixels
+        :param height: Height of the canvas, in pixels
+        """
+        self._draw = draw
+        self.width = width
+        self.height = height
+        self._stride = (width + 7) // 8
+        self.bits = bytearray(self._stride * height)
+        self._dirty = bytearray(b'\x01') * height
+
+    def fill(self, value=0):
+        """Set (or clear) every pixel on the canvas.
+
+        :param value: 1 to set the pixels, 0 to clear them
+        """
+        v = 0xff if value else 0
+        bits = self.bits
+        for i in range(len(bits)):
+            bits[i] = v
+        dirty = self._dirty
+        for i in range(len(dirty)):
+            dirty[i] = 1
+
+    def set(self, x, y):
+        """Set a pixel (draw it in the foreground colour)."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.bits[y * self._stride + (x >> 3)] |= 0x80 >> (x & 7)
+            self._dirty[y] = 1
+
+    def clear(self, x, y):
+        """Clear a pixel (draw it in the background colour)."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.bits[y * self._stride + (x >> 3)] &= 0xff ^ (0x80 >> (x & 7))
+            self._dirty[y] = 1
+
+    def get(self, x, y):
+        """Check whether a pixel is set.
+
+        :returns: True if the pixel is set, False if it is clear or is
+                  outside the canvas
+        """
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return bool(self.bits[y * self._stride + (x >> 3)] &
+                        (0x80 >> (x & 7)))
+        return False
+
+    def span(self, x, y, w, value=1):
+        """Set (or clear) a horizontal run of pixels.
+
+        :param x:     X coordinate of the left-most pixel of the run
+        :param y:     Y coordinate of the run
+        :param w:     Length of the run, in pixels
+        :param value: 1 to set the pixels, 0 to clear them
+        """
+        if y < 0 or y >= self.height:
+            return
+        if x < 0:
+            w += x
+            x = 0
+        w = min(w, self.width - x)
+        if w > 0:
+            _span1bit(self.bits, 8 * y * self._stride + x, w, value)
+            self._dirty[y] = 1
+
+    def blit(self, image, x, y):
+        """Copy a 1-bit RLE image onto the canvas.
+
+        Foreground pixels of the image are set and background pixels are
+        cleared.
+
+        :param image: Image data in 1-bit RLE format
+        :param x:     X coordinate for the left-most pixels in the image
+        :param y:     Y coordinate for the top-most pixels in the image
+        """
+        (sx, sy, rle) = image
+        pos = 0
+        value = 0
+        for rl in rle:
+            while rl:
+                row = pos // sx
+                col = pos - row * sx
+                count = min(rl, sx - col)
+                self.span(x + col, y + row, count, value)
+                pos += count
+                rl -= count
+            value ^= 1
+
+    def flush(self, x=0, y=0):
+        """Draw the rows of the canvas that have changed since the last flush.
+
+        Set pixels are drawn in the foreground colour and clear pixels in
+        the background colour. Consecutive changed rows are sent using a
+        single window. Rows that are not drawn in full, because they are
+        partly outside the clip rectangle, are still regarded as changed
+        afterwards.
+
+        :param x: X coordinate of the left-most pixels of the canvas
+        :param y: Y coordinate of the top-most pixels of the canvas
+        """
+        draw = self._draw
+        display = draw._display
+        width = self.width
+        stride = self._stride
+        bits = memoryview(self.bits)
+        dirty = self._dirty
+
+        # Only the part of the canvas inside the clip rectangle is drawn
+        rect = (x, y, width, self.height)
+        if draw._clip:
+            rect = _intersect(draw._clip, rect)
+            if not rect:
+                return
+        (cx, cy, cw, ch) = rect
+        skip = 2 * (cx - x)
+
+        lut = draw._expander()
+        rows = min(display.buffer_rows(width), ch)
+        linesz = 2 * width
+        buf = memoryview(display.linebuffer)[0:linesz*rows]
+
+        row = cy - y
+        bottom = row + ch
+        while row < bottom:
+            if not dirty[row]:
+                row += 1
+                continue
+            end = row + 1
+            while end < bottom and dirty[end]:
+                end += 1
+
+            display.set_window(cx, y + row, cw, end - row)
+            display.quick_start()
+            lp = 0
+            for r in range(row, end):
+                _bitblit(buf[lp:], bits[r*stride:], lut, width)
+                if cw < width:
+                    # Send just the visible part of the row
+                    display.quick_write(buf[lp+skip:lp+skip+2*cw])
+                    continue
+                dirty[r] = 0
+                lp += linesz
+                if lp >= len(buf):
+                    display.quick_write(buf)
+                    lp = 0
+            if lp:
+                display.quick_write(buf[0:lp])
+            display.quick_end()
+            row = end
+
+class DrawList(object):
+    """A list of drawing primitives to be drawn as a single frame.
+
+    Primitives are added using the same methods, taking the same arguments,
+    as :py:class:`.Draw565` but nothing is drawn until the list is passed
+    to :py:meth:`Draw565.submit`. The list has its own colours, font and
+    clip rectangles, which start out matching those of the drawing library.
+
+    .. data:: ops
+
+        The recorded primitives.
+
+    .. automethod:: __init__
+    """
+    def __init__(self, draw):
+        """Create an empty draw list.
+
+        :param draw: The :py:class:`.Draw565` the list will be submitted to
+        """
+        self._draw = draw
+        self._bgfg = draw._bgfg
+        self._font = draw._font
+        self._clip = draw._clip
+        self._clips = []
+        self.ops = []
+
+    def _capture(self, fn, args, kwargs):
+        """Record a primitive using the drawing library's own recorder."""
+        draw = self._draw
+        (ops, bgfg, font) = (draw._ops, draw._bgfg, draw._font)
+        (clip, clips) = (draw._clip, draw._clips)
+        draw._ops = self.ops
+        draw._bgfg = self._bgfg
+        draw._font = self._font
+        draw._clip = self._clip
+        draw._clips = self._clips
+        try:
+            fn(draw, *args, **kwargs)
+        finally:
+            self._clip = draw._clip
+            draw._ops = ops
+            draw._bgfg = bgfg
+            draw._font = font
+            draw._clip = clip
+            draw._clips = clips
+
+    def fill(self, *args, **kwargs):
+        """Add a :py:meth:`Draw565.fill` to the list."""
+        self._capture(Draw565.fill, args, kwargs)
+
+    def blit(self, *args, **kwargs):
+        """Add a :py:meth:`Draw565.blit` to the list."""
+        self._capture(Draw565.blit, args, kwargs)
+
+    def blit_region(self, *args, **kwargs):
+        """Add a :py:meth:`Draw565.blit_region` to the list."""
+        self._capture(Draw565.blit_region, args, kwargs)
+
+    def rleblit(self, *args, **kwargs):
+        """Add a :py:meth:`Draw565.rleblit` to the list."""
+        self._capture(Draw565.rleblit, args, kwargs)
+
+    def string(self, *args, **kwargs):
+        """Add a :py:meth:`Draw565.string` to the list."""
+        self._capture(Draw565.string, args, kwargs)
+
+    def line(self, *args, **kwargs):
+        """Add a :py:meth:`Draw565.line` to the list."""
+        self._capture(Draw565.line, args, kwargs)
+
+    def circle(self, *args, **kwargs):
+        """Add a :py:meth:`Draw565.circle` to the list."""
+        self._capture(Draw565.circle, args, kwargs)
+
+    def arc(self, *args, **kwargs):
+        """Add a :py:meth:`Draw565.arc` to the list."""
+        self._capture(Draw565.arc, args, kwargs)
+
+    def polygon(self, *args, **kwargs):
+        """Add a :py:meth:`Draw565.polygon` to the list."""
+        self._capture(Draw565.polygon, args, kwargs)
+
+    def number(self, *args, **kwargs):
+        """Add a :py:meth:`Draw565.number` to the list."""
+        self._capture(Draw565.number, args, kwargs)
+
+    def push_clip(self, *args, **kwargs):
+        """Clip the primitives added after this call."""
+        self._capture(Draw565.push_clip, args, kwargs)
+
+    def pop_clip(self):
+        """Restore the clip rectangle replaced by the last push."""
+        self._capture(Draw565.pop_clip, (), {})
+
+    def set_color(self, color, bg=0):
+        """Set the colours used by primitives added after this call."""
+        self._bgfg = (bg << 16) + color
+
+    def set_font(self, font):
+        """Set the font used by strings added after this call."""
+        self._font = font
 
 class Draw565(object):
     """Drawing library for RGB565 displays.
@@ -91,6 +1115,29 @@ class Draw565(object):
     A full framebufer is not required although the library will
     'borrow' a line buffer from the underlying display driver.
 
+    The library keeps about 8KB of RAM between calls: the glyph cache (at
+    most 4KB of pixel data), the 4KB monochrome expansion table (allocated
+    when 1-bit text or images are first drawn) and a 128 byte buffer for
+    reading images from files. The band buffer used by :py:meth:`~.render`
+    and the RAM cache of a :py:class:`.SpriteCache` are only held while
+    they are in use.
+
+    .. data:: glyph_cache
+
+        The :py:class:`.GlyphCache` used to hold recently rendered
+        characters.
+
+    .. data:: damage
+
+        List of (x, y, w, h) rectangles, with overlapping rectangles merged,
+        that were redrawn by the most recent :py:meth:`~.flush`.
+
+    .. data:: frame_cost
+
+        (primitives, microseconds) tuple describing the most recent
+        :py:meth:`~.submit`. It records how many primitives were drawn, after
+        coalescing, and how long it took to draw them.
+
     .. automethod:: __init__
     """
 
@@ -101,15 +1148,65 @@ class Draw565(object):
         and 24pt Sans Serif text.
         """
         self._display = display
+        self.glyph_cache = GlyphCache()
+        self._lut = None
+        self._lut_bgfg = None
+        self._blend = None
+        self._blend_bgfg = None
+        self._rbuf = None
+        self._band = None
+        self._ops = None
+        self._clip = None
+        self._clips = []
+        self._numbers = {}
+        self._geom = array.array('H', bytes(10))
+        self._views = {}
+        self._views_buf = None
+        self._screen = []
+        self.damage = []
+        self.frame_cost = (0, 0)
         self.reset()
 
     def reset(self):
         """Restore the default colours and font.
 
         Default colours are white-on-block (white foreground, black
-        background) and the default font is 24pt Sans Serif."""
+        background) and the default font is 24pt Sans Serif. Any clip
+        rectangles are also removed and any numbers drawn by
+        :py:meth:`~.number` are forgotten."""
         self.set_color(0xffff)
         self.set_font(fonts.sans24)
+        self._clip = None
+        self._clips = []
+        self._numbers.clear()
+
+    def push_clip(self, x, y, w, h):
+        """Restrict drawing to a rectangle.
+
+        Every drawing primitive is clipped to the rectangle until the
+        matching call to :py:meth:`~.pop_clip`. Anything that falls
+        completely outside the rectangle is discarded before any commands
+        are sent to the display. Clip rectangles nest: the new rectangle is
+        combined with the current one so drawing is restricted to the area
+        they have in common.
+
+        :param x: X coordinate of the left-most pixels of the rectangle
+        :param y: Y coordinate of the top-most pixels of the rectangle
+        :param w: Width of the rectangle
+        :param h: Height of the rectangle
+        """
+        clip = self._clip
+        self._clips.append(clip)
+        rect = (x, y, w, h)
+        if clip:
+            rect = _intersect(clip, rect)
+            if not rect:
+                rect = (0, 0, 0, 0)
+        self._clip = rect
+
+    def pop_clip(self):
+        """Restore the clip rectangle that was replaced by the last push."""
+        self._clip = self._clips.pop()
 
     def fill(self, bg=None, x=0, y=0, w=None, h=None):
         """Draw a solid colour rectangle.
@@ -127,23 +1224,64 @@ class Draw565(object):
         """
         if bg is None:
             bg = self._bgfg >> 16
-        self._display.fill(bg, x, y, w, h)
+        display = self._display
+        if not w:
+            w = display.width - x
+        if not h:
+            h = display.height - y
+        clip = self._clip
+        if clip:
+            rect = _intersect(clip, (x, y, w, h))
+            if not rect:
+                return
+            (x, y, w, h) = rect
+        if self._ops is not None:
+            self._record(_FILL, (x, y, w, h), (bg, x, y, w, h))
+            return
+        if self._numbers:
+            self._overdraw(x, y, w, h)
+        display.fill(bg, x, y, w, h)
 
     @micropython.native
     def blit(self, image, x, y, fg=0xffff, c1=0x4a69, c2=0x7bef):
         """Decode and draw an encoded image.
 
-        :param image: Image data in either 1-bit RLE or 2-bit RLE formats. The
-                      format will be autodetected
+        2-bit and 8-bit RLE images can also be drawn straight from the
+        filesystem by passing the path of the image file, or a file opened
+        in binary mode, instead of the image data. The file is decoded a
+        small chunk at a time so the image never needs to fit in RAM. An
+        open file is read from its current position, and is left at that
+        position afterwards.
+
+        :param image: Image data in either 1-bit RLE, 2-bit RLE or 8-bit RLE
+                      formats. The format will be autodetected
         :param x: X coordinate for the left-most pixels in the image
         :param y: Y coordinate for the top-most pixels in the image
         """
-        if len(image) == 3:
-            # Legacy 1-bit image
-            self.rleblit(image, (x, y), fg)
-        else: #elif image[0] == 2:
-            # 2-bit RLE image, (255x255, v1)
-            self._rle2bit(image, x, y, fg, c1, c2)
+        if _is_file(image):
+            (sx, sy) = self._file_size(image)
+            rect = (x, y, sx, sy)
+        elif len(image) == 3:
+            rect = (x, y, image[0], image[1])
+        else:
+            rect = (x, y, image[1], image[2])
+        clip = self._clip
+        if clip:
+            r = _intersect(clip, rect)
+            if not r:
+                return
+            if r != rect:
+                # Partially clipped images are drawn as a region
+                self.blit_region(image, (r[0] - x, r[1] - y, r[2], r[3]),
+                                 r[0], r[1], fg, c1, c2)
+                return
+        if self._ops is not None:
+            self._record(_BLIT, rect, (image, x, y, fg, c1, c2))
+            return
+        if self._numbers:
+            self._overdraw(*rect)
+
+        self._decode(image, (0, 0, rect[2], rect[3]), x, y, fg, c1, c2, 0)
 
     @micropython.native
     def rleblit(self, image, pos=(0, 0), fg=0xffff, bg=0):
@@ -152,86 +1290,247 @@ class Draw565(object):
         .. deprecated:: M2
             Use :py:meth:`~.blit` instead.
         """
-        display = self._display
-        write_data = display.write_data
-        (sx, sy, rle) = image
+        rect = (pos[0], pos[1], image[0], image[1])
+        clip = self._clip
+        if clip:
+            r = _intersect(clip, rect)
+            if not r:
+                return
+            if r != rect:
+                self.blit_region(image, (r[0] - pos[0], r[1] - pos[1],
+                                         r[2], r[3]),
+                                 r[0], r[1], fg, 0, 0, bg)
+                return
+        if self._ops is not None:
+            self._record(_RLEBLIT, rect, (image, pos, fg, bg))
+            return
+        if self._numbers:
+            self._overdraw(*rect)
 
-        display.set_window(pos[0], pos[1], sx, sy)
+        self._decode(image, (0, 0, image[0], image[1]), pos[0], pos[1],
+                     fg, 0, 0, bg)
 
-        buf = memoryview(display.linebuffer)[0:2*sx]
-        bp = 0
-        color = bg
+    def blit_region(self, image, src_rect, x, y,
+                    fg=0xffff, c1=0x4a69, c2=0x7bef, bg=0):
+        """Decode and draw part of an encoded image.
 
-        for rl in rle:
-            while rl:
-                count = min(sx - bp, rl)
-                _fill(buf, color, count, bp)
-                bp += count
-                rl -= count
+        If the image has a row index (see ``tools/rle_encode.py --index``)
+        then decoding starts from the nearest indexed row above the region,
+        otherwise the image is decoded from the start. Either way only the
+        pixels within the region are sent to the display.
+
+        :param image: Image data in either 1-bit RLE, 2-bit RLE or 8-bit RLE
+                      formats, or a 2-bit or 8-bit image file (see
+                      :py:meth:`~.blit`). The format will be autodetected
+        :param src_rect: (x, y, w, h) rectangle, within the image, to draw
+        :param x: X coordinate for the left-most pixels of the region
+        :param y: Y coordinate for the top-most pixels of the region
+        :param bg: Background colour, defaults to black
+        """
+        (rx, ry, rw, rh) = src_rect
+        clip = self._clip
+        if clip:
+            r = _intersect(clip, (x, y, rw, rh))
+            if not r:
+                return
+            rx += r[0] - x
+            ry += r[1] - y
+            (x, y, rw, rh) = r
+            src_rect = (rx, ry, rw, rh)
+        if self._ops is not None:
+            self._record(_REGION, (x, y, rw, rh),
+                         (image, src_rect, x, y, fg, c1, c2, bg))
+            return
+        if self._numbers:
+            self._overdraw(x, y, rw, rh)
+        self._decode(image, src_rect, x, y, fg, c1, c2, bg)
+
+    def _open(self, image):
+        """Open an image file.
+
+        :returns: (file, offset) tuple, where offset is the position of the
+                  image within the file
+        """
+        if isinstance(image, str):
+            return (open(image, 'rb'), 0)
+        return (image, image.tell())
 
-                if bp >= sx:
-                    write_data(buf)
-                    bp = 0
+    def _reader(self):
+        """Get the buffer used to read images from files.
 
-            if color == bg:
-                color = fg
+        The buffer is allocated on first use and then reused by every file
+        that is drawn.
+        """
+        rbuf = self._rbuf
+        if not rbuf:
+            rbuf = self._rbuf = bytearray(_READ_SIZE)
+        return rbuf
+
+    def _file_size(self, image):
+        """Read the width and height of an image file."""
+        (f, start) = self._open(image)
+        hdr = memoryview(self._reader())[0:3]
+        try:
+            f.readinto(hdr)
+        finally:
+            if f is image:
+                f.seek(start)
             else:
-                color = bg
+                f.close()
+        return (hdr[1], hdr[2])
 
     @micropython.native
-    def _rle2bit(self, image, x, y, fg, c1, c2):
-        """Decode and draw a 2-bit RLE image."""
-        display = self._display
-        quick_write = display.quick_write
-        sx = image[1]
-        sy = image[2]
-        rle = memoryview(image)[3:]
+    def _decode(self, image, src_rect, x, y, fg, c1, c2, bg):
+        """Decode and draw part of an encoded image.
 
-        display.set_window(x, y, sx, sy)
+        This is the decoder behind :py:meth:`~.blit`,
+        :py:meth:`~.blit_region` and :py:meth:`~.rleblit`. Images in RAM are
+        decoded in place whilst image files are read into a small buffer, a
+        chunk at a time. The runs are decoded one byte at a time so runs
+        that are split across chunks need no special handling.
 
-        if sx <= (len(display.linebuffer) // 4) and not bool(sy & 1):
-            sx *= 2
-            sy //= 2
+        The display may share its SPI bus with the flash holding an image
+        file so the chip select must not be held between writes (which is
+        why files use write_data() rather than an optimized write sequence).
+        """
+        (rx, ry, rw, rh) = src_rect
+        display = self._display
+        clut8 = _clut8_table()
 
-        palette = array.array('H', (0, c1, c2, fg))
+        # The palette holds byte-swapped pixels (ready for the SPI bus)
+        palette = array.array('H', (bg, c1, c2, fg))
+        for i in range(4):
+            palette[i] = (palette[i] >> 8) + ((palette[i] & 0xff) << 8)
         next_color = 1
-        rl = 0
-        buf = memoryview(display.linebuffer)[0:2*sx]
-        bp = 0
 
-        display.quick_start()
-        for op in rle:
-            if rl == 0:
-                px = op >> 6
-                rl = op & 0x3f
-                if 0 == rl:
-                    rl = -1
-                    continue
-                if rl >= 63:
-                    continue
-            elif rl > 0:
-                rl += op
-                if op >= 255:
-                    continue
+        f = None
+        if _is_file(image):
+            (f, start) = self._open(image)
+            rle = self._reader()
+            f.readinto(memoryview(rle)[0:4])
+            hdr = rle
+        elif len(image) == 3:
+            # Legacy 1-bit image
+            rle = image[2]
+            hdr = b'\x01\x00\x00'
+        else:
+            rle = image
+            hdr = image
+        fmt = hdr[0] & 0x7f
+        sx = image[0] if fmt == 1 else hdr[1]
+
+        try:
+            i = 0 if fmt == 1 else 3
+            pos = 0
+            if hdr[0] & 0x80:
+                # Seek to the nearest indexed row
+                interval = hdr[3]
+                e = 4 + 8 * (ry // interval)
+                idx = rle
+                if f:
+                    f.seek(start + e)
+                    f.readinto(memoryview(rle)[0:8])
+                    e = 0
+                i = idx[e] + (idx[e+1] << 8)
+                pos = (ry // interval) * interval * sx
+                pos -= idx[e+2] + (idx[e+3] << 8)
+                flags = idx[e+7]
+                next_color = flags & 3
+                for j in range(1, 4):
+                    if flags & (1 << (j + 1)):
+                        palette[j] = clut8[idx[e+3+j]]
+            if f:
+                f.seek(start + i)
+                write = display.write_data
             else:
-                palette[next_color] = _clut8_rgb565(op)
-                if next_color < 3:
-                    next_color += 1
-                else:
-                    next_color = 1
-                rl = 0
-                continue
+                write = display.quick_write
+                display.quick_start()
 
-            while rl:
-                count = min(sx - bp, rl)
-                _fill(buf, palette[px], count, bp)
-                bp += count
-                rl -= count
+            display.set_window(x, y, rw, rh)
 
-                if bp >= sx:
-                    quick_write(buf)
-                    bp = 0
-        display.quick_end()
+            # Decode as many rows as will fit in the line buffer
+            sz = rw * min(display.buffer_rows(rw), rh)
+            buf = memoryview(display.linebuffer)[0:2*sz]
+            bp = 0
+
+            n = len(rle)
+            last = (ry + rh) * sx
+            px = 3
+            color = 0
+            rl = 0
+            state = 0
+            while pos < last:
+                if f:
+                    n = f.readinto(rle)
+                    i = 0
+                if i >= n:
+                    break
+                while i < n:
+                    op = rle[i]
+                    i += 1
+                    if state == 1:
+                        # Extended run length
+                        rl += op
+                        if op >= 255:
+                            continue
+                        state = 0
+                    elif state == 2:
+                        # Palette change
+                        palette[next_color] = clut8[op]
+                        if next_color < 3:
+                            next_color += 1
+                        else:
+                            next_color = 1
+                        state = 0
+                        continue
+                    elif fmt == 1:
+                        # Runs alternate between background and foreground
+                        px = 3 - px
+                        color = palette[px]
+                        rl = op
+                    elif fmt == 8:
+                        color = clut8[op]
+                        rl = 0
+                        state = 1
+                        continue
+                    else:
+                        color = palette[op >> 6]
+                        rl = op & 0x3f
+                        if rl == 0:
+                            state = 2
+                            continue
+                        if rl >= 63:
+                            state = 1
+                            continue
+
+                    # Clip the run, one row at a time, to the region
+                    end = min(pos + rl, last)
+                    while pos < end:
+                        row = pos // sx
+                        col = pos - row * sx
+                        count = min(end - pos, sx - col)
+                        if row >= ry:
+                            a = max(col, rx)
+                            b = min(col + count, rx + rw)
+                            if a < b:
+                                _fill_swapped(buf, color, b - a, bp)
+                                bp += b - a
+                                if bp >= sz:
+                                    write(buf)
+                                    bp = 0
+                        pos += count
+                    if pos >= last:
+                        break
+
+            if bp:
+                write(buf[0:2*bp])
+        finally:
+            if not f:
+                display.quick_end()
+            elif f is image:
+                f.seek(start)
+            else:
+                f.close()
 
     def set_color(self, color, bg=0):
         """Set the foreground and background colours.
@@ -245,10 +1544,37 @@ class Draw565(object):
         """
         self._bgfg = (bg << 16) + color
 
+    def _expander(self):
+        """Get the monochrome expansion table for the current colours.
+
+        The table is allocated on first use and only rebuilt when the colours
+        have changed since it was last populated.
+        """
+        lut = self._lut
+        if not lut:
+            lut = self._lut = bytearray(4096)
+        if self._lut_bgfg != self._bgfg:
+            _expand_lut(lut, self._bgfg)
+            self._lut_bgfg = self._bgfg
+        return lut
+
+    def _blender(self, bpp):
+        """Get the blend table for the current colours.
+
+        The table is only recalculated when the colours (or the depth of
+        the font) have changed since it was last requested.
+        """
+        blend = self._blend
+        if self._blend_bgfg != self._bgfg or len(blend) != (1 << bpp):
+            blend = self._blend = _blend_table(self._bgfg, bpp)
+            self._blend_bgfg = self._bgfg
+        return blend
+
     def set_font(self, font):
         """Set the font used for rendering text.
 
-        :param font:  A font module generated using ``font_to_py.py``.
+        :param font:  A font module generated using ``font_to_py.py`` or,
+                      for anti-aliased text, ``tools/font_aa.py``.
         """
         self._font = font
 
@@ -265,24 +1591,626 @@ class Draw565(object):
                       we update one string with a narrower one there is no
                       need to "undraw" it)
         """
+        clip = self._clip
+        if self._ops is not None:
+            font = self._font
+            w = width if width else fonts.width(font, s)
+            rect = (x, y, w, font.height())
+            if clip:
+                rect = _intersect(clip, rect)
+                if not rect:
+                    return
+            self._record(_STRING, rect, (s, x, y, width))
+            return
+
         display = self._display
         bgfg = self._bgfg
         font = self._font
+        cache = self.glyph_cache
+        lut = None
+        h = font.height()
+        limit = display.width
+        bpp = font.bpp() if hasattr(font, 'bpp') else 1
 
-        if width:
-            (w, h) = _bounding_box(s, font)
-            leftpad = (width - w) // 2
-            rightpad = width - w - leftpad
-            display.fill(0, x, y, leftpad, h)
-            x += leftpad
+        # Reject strings that are clipped out of sight before rendering
+        # any glyphs
+        if clip and (y >= clip[1] + clip[3] or y + h <= clip[1] or
+                     x >= clip[0] + clip[2]):
+            return
 
+        # Gather the glyphs (and measure the string). Glyphs that would not
+        # fit on the display are dropped.
+        #
+        # A glyph that misses is only added to the cache if that will not
+        # evict any glyph used earlier in the string (these are the most
+        # recently used glyphs so the check only needs to know how much of
+        # the budget they occupy). Otherwise strings longer than the cache
+        # would evict their own glyphs, allocating new ones every time they
+        # are drawn, and it is better to expand them into the line buffer.
+        glyphs = []
+        w = 0
+        pinned = 0
         for ch in s:
-            glyph = font.get_ch(ch)
-            _draw_glyph(display, glyph, x, y, bgfg)
-            x += glyph[2] + 1
+            glyph = cache.get(font, ch, bgfg)
+            if not glyph:
+                glyph = font.get_ch(ch)
+                if not lut:
+                    lut = self._expander() if bpp == 1 else self._blender(bpp)
+                if pinned + 2 * (glyph[2]+1) * glyph[1] <= cache.budget:
+                    glyph = _render_glyph(glyph, lut, bpp)
+                    cache.put(font, ch, bgfg, glyph)
+                else:
+                    glyph = (glyph[0], 0, glyph[2])
+            if glyph[1]:
+                pinned += len(glyph[0])
+            if w + glyph[2] + 1 > limit:
+                break
+            glyphs.append(glyph)
+            w += glyph[2] + 1
 
         if width:
-            display.fill(0, x, y, rightpad, h)
+            leftpad = max((width - w) // 2, 0)
+            rightpad = max(width - w - leftpad, 0)
+        else:
+            leftpad = 0
+            rightpad = 0
+        width = min(leftpad + w + rightpad, limit)
+        if not width:
+            return
+
+        # Only the rows and columns inside the clip rectangle are drawn
+        rect = (x, y, width, h)
+        if clip:
+            rect = _intersect(clip, rect)
+            if not rect:
+                return
+        (cx, cy, cw, ch) = rect
+        skip = 2 * (cx - x)
+        if self._numbers:
+            self._overdraw(cx, cy, cw, ch)
+
+        # Lay out as many rows as will fit in the line buffer
+        rows = min(display.buffer_rows(width), ch)
+        linesz = 2 * width
+        buf = memoryview(display.linebuffer)[0:linesz*rows]
+
+        # The padding, and the gaps between uncached glyphs, are the same on
+        # every row so they only need to be drawn once
+        _fill(buf, 0, width*rows, 0)
+
+        display.set_window(cx, cy, cw, ch)
+        display.quick_start()
+        lp = 0
+        for row in range(cy - y, cy - y + ch):
+            bp = lp + 2*leftpad
+            for (px, rendered, gw) in glyphs:
+                if rendered:
+                    stride = 2 * (gw+1)
+                    sp = row * stride
+                    buf[bp:bp+stride] = px[sp:sp+stride]
+                elif bpp == 1:
+                    _bitblit(buf[bp:], px[row*((gw+7)//8):], lut, gw)
+                else:
+                    _aablit(buf[bp:], px[row*((gw*bpp+7)//8):], lut, gw)
+                bp += 2 * (gw+1)
+
+            if cw < width:
+                # Send just the visible part of the row
+                display.quick_write(buf[lp+skip:lp+skip+2*cw])
+                continue
+            lp += linesz
+            if lp >= len(buf):
+                display.quick_write(buf)
+                lp = 0
+        if lp:
+            display.quick_write(buf[0:lp])
+        display.quick_end()
+
+    def line(self, x0, y0, x1, y1, color=None, width=1):
+        """Draw a straight line.
+
+        :param x0:    X coordinate of the start of the line
+        :param y0:    Y coordinate of the start of the line
+        :param x1:    X coordinate of the end of the line
+        :param y1:    Y coordinate of the end of the line
+        :param color: Colour of the line, defaults to the foreground colour
+        :param width: Width of the line, in pixels
+        """
+        if color is None:
+            color = self._bgfg & 0xffff
+        if width > 1:
+            # Draw wide lines as a rectangle rotated to match the line
+            dx = x1 - x0
+            dy = y1 - y0
+            d = math.sqrt(dx * dx + dy * dy) or 1
+            ox = -dy * width / (2 * d)
+            oy = dx * width / (2 * d)
+            self.polygon(((x0 + ox, y0 + oy), (x1 + ox, y1 + oy),
+                          (x1 - ox, y1 - oy), (x0 - ox, y0 - oy)), color)
+            return
+
+        if y0 > y1:
+            (x0, y0, x1, y1) = (x1, y1, x0, y0)
+        dx = abs(x1 - x0)
+        dy = y1 - y0
+        sx = 1 if x0 < x1 else -1
+        err = dx - dy
+        spans = _Spans(self, color)
+
+        # Bresenham's algorithm, gathering the pixels on each row into a span
+        start = x0
+        while True:
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 < dx:
+                spans.row(y0, ((min(start, x0), max(start, x0)),))
+                err += dx
+                y0 += 1
+                if e2 > -dy:
+                    err -= dy
+                    x0 += sx
+                start = x0
+            else:
+                err -= dy
+                x0 += sx
+        spans.row(y0, ((min(start, x0), max(start, x0)),))
+        spans.close()
+
+    def circle(self, x, y, r, color=None, width=None):
+        """Draw a circle.
+
+        :param x:     X coordinate of the centre of the circle
+        :param y:     Y coordinate of the centre of the circle
+        :param r:     Radius of the circle, in pixels
+        :param color: Colour of the circle, defaults to the foreground colour
+        :param width: Width of the ring, in pixels, defaults to None (which
+                      means draw a filled circle)
+        """
+        if color is None:
+            color = self._bgfg & 0xffff
+        ri = r - width if width else -1
+        spans = _Spans(self, color)
+        for dy in range(-r, r+1):
+            xo = int(math.sqrt(r * r + r - dy * dy))
+            if abs(dy) <= ri:
+                xi = int(math.sqrt(ri * ri + ri - dy * dy))
+                spans.row(y + dy, ((x - xo, x - xi - 1), (x + xi + 1, x + xo)))
+            else:
+                spans.row(y + dy, ((x - xo, x + xo),))
+        spans.close()
+
+    def arc(self, x, y, r, start, end, color=None, width=4):
+        """Draw an arc.
+
+        Angles are measured in degrees, clockwise from 12 o'clock, making
+        it simple to draw watch hands and progress rings.
+
+        :param x:     X coordinate of the centre of the arc
+        :param y:     Y coordinate of the centre of the arc
+        :param r:     Outer radius of the arc, in pixels
+        :param start: Angle at which the arc starts
+        :param end:   Angle at which the arc ends
+        :param color: Colour of the arc, defaults to the foreground colour
+        :param width: Width of the arc, in pixels
+        """
+        if end < start:
+            end += 360
+        steps = max(int((end - start) * r / 360), 2)
+        ri = r - width
+        outer = []
+        inner = []
+        for i in range(steps + 1):
+            a = math.radians(start + (end - start) * i / steps)
+            sin = math.sin(a)
+            cos = math.cos(a)
+            outer.append((x + r * sin, y - r * cos))
+            inner.append((x + ri * sin, y - ri * cos))
+        inner.reverse()
+        self.polygon(outer + inner, color)
+
+    def polygon(self, points, color=None):
+        """Draw a filled polygon.
+
+        Pixels are filled if their centre lies inside the polygon (using the
+        even-odd rule).
+
+        :param points: Sequence of (x, y) tuples, the polygon is closed
+                       automatically
+        :param color:  Colour of the polygon, defaults to the foreground
+                       colour
+        """
+        if color is None:
+            color = self._bgfg & 0xffff
+        n = len(points)
+        top = int(min(p[1] for p in points))
+        bottom = int(max(p[1] for p in points))
+        spans = _Spans(self, color)
+        xs = []
+        for y in range(top, bottom + 1):
+            yc = y + 0.5
+            xs.clear()
+            (xa, ya) = points[-1]
+            for i in range(n):
+                (xb, yb) = points[i]
+                if (ya <= yc) != (yb <= yc):
+                    xs.append(xa + (yc - ya) * (xb - xa) / (yb - ya))
+                (xa, ya) = (xb, yb)
+            xs.sort()
+            spans.row(y, [(math.ceil(xs[i] - 0.5), math.ceil(xs[i+1] - 0.5) - 1)
+                          for i in range(0, len(xs) - 1, 2)])
+        spans.close()
+
+    def number(self, value, x, y, digits=1, align='left'):
+        """Draw a non-negative integer.
+
+        The number is drawn straight from the glyphs for the digits of the
+        current font, without being converted into a string, so drawing a
+        number does not allocate memory. Each digit is centred in a cell as
+        wide as the widest digit so the digits stay put as the number
+        changes.
+
+        The digits drawn at each location are remembered and only those
+        that have changed since the previous call at the same location are
+        redrawn. Drawing over the number with any of the other primitives
+        makes the library forget it and the next call redraws it in full.
+
+        :param value:  Number to draw
+        :param x:      X coordinate of the left-most pixels of the number or,
+                       if the number is right aligned, of the pixels just to
+                       the right of the number
+        :param y:      Y coordinate of the top-most pixels of the number
+        :param digits: Minimum number of digits to draw, shorter numbers are
+                       padded with leading zeros
+        :param align:  'left' or 'right'
+        """
+        (glyphs, cw, bpp) = _digit_table(self._font)
+        n = 1
+        v = value
+        while v >= 10:
+            v //= 10
+            n += 1
+        n = min(max(n, digits), 10)
+        right = align == 'right'
+
+        if self._ops is not None:
+            rect = (x - n * cw if right else x, y, n * cw, glyphs[0][1])
+            clip = self._clip
+            if clip:
+                rect = _intersect(clip, rect)
+                if not rect:
+                    return
+            self._record(_NUMBER, rect, (value, x, y, n, right, False))
+            return
+        self._number(value, x, y, n, right, True)
+
+    def _number(self, value, x, y, n, right, memo):
+        """Draw the digits of a number.
+
+        :param n:    Number of digits to draw
+        :param memo: True to draw only the digits that have changed since
+                     the number was last drawn
+        """
+        display = self._display
+        font = self._font
+        bgfg = self._bgfg
+        (glyphs, cw, bpp) = _digit_table(font)
+        h = glyphs[0][1]
+        lut = self._expander() if bpp == 1 else self._blender(bpp)
+
+        # Each location remembers (rect, font, bgfg, cells, count) where
+        # cells holds the digit drawn in each cell (or 0xff if it is blank)
+        memo = memo and not isinstance(display, _Band)
+        key = (x * 1024 + y) * 2 + right
+        state = self._numbers.get(key) if memo else None
+        if not state:
+            state = [None, None, 0, bytearray(b'\xff') * 10, 0]
+            if memo:
+                self._numbers[key] = state
+        cells = state[3]
+        old = state[4]
+        redraw = state[1] is not font or state[2] != bgfg
+        if state[1] and state[1] is not font:
+            # Cells drawn using a different font will not line up
+            r = state[0]
+            self.fill(bgfg >> 16, r[0], r[1], r[2], r[3])
+            old = 0
+
+        for i in range(max(n, old)):
+            if i < n:
+                d = value % 10
+                value //= 10
+                p = i if right else n - 1 - i
+            else:
+                d = 0xff
+                p = i
+            if cells[p] == d and not redraw:
+                continue
+            cells[p] = d
+            cx = x - (p + 1) * cw if right else x + p * cw
+            if cx < 0 or cx + cw > display.width:
+                # Digits that would not fit on the display are dropped
+                continue
+            if d == 0xff:
+                self.fill(bgfg >> 16, cx, y, cw, h)
+            else:
+                self._digit(glyphs[d], cx, y, cw, lut, bpp)
+
+        if redraw or old != n:
+            state[0] = (x - n * cw if right else x, y, n * cw, h)
+        state[1] = font
+        state[2] = bgfg
+        state[4] = n
+
+    def _digit(self, glyph, x, y, cw, lut, bpp):
+        """Draw a digit centred in a cell of the given width."""
+        display = self._display
+        linebuffer = display.linebuffer
+        top = 0
+        cx = x
+        cy = y
+        ccw = cw
+        ch = glyph[1]
+        clip = self._clip
+        if clip:
+            r = _intersect(clip, (x, y, cw, ch))
+            if not r:
+                return
+            (cx, cy, ccw, ch) = r
+            top = cy - y
+
+        geom = self._geom
+        geom[0] = glyph[2]
+        geom[1] = cw
+        geom[4] = bpp
+        rows = min(display.buffer_rows(cw), ch)
+
+        display.set_window(cx, cy, ccw, ch)
+        display.quick_start()
+        row = top
+        while row < top + ch:
+            geom[2] = row
+            geom[3] = min(rows, top + ch - row)
+            _digit_rows(linebuffer, glyph[0], lut, geom)
+            if ccw < cw:
+                # Send just the visible part of each row
+                for i in range(geom[3]):
+                    lp = 2 * (i * cw + cx - x)
+                    display.quick_write(memoryview(linebuffer)[lp:lp+2*ccw])
+            else:
+                display.quick_write(self._view(2 * cw * geom[3]))
+            row += rows
+        display.quick_end()
+
+    def _view(self, n):
+        """Get a memoryview of the first n bytes of the line buffer.
+
+        The views are kept so that they only need to be allocated once.
+        """
+        linebuffer = self._display.linebuffer
+        if self._views_buf is not linebuffer:
+            self._views = {}
+            self._views_buf = linebuffer
+        mv = self._views.get(n)
+        if not mv:
+            mv = memoryview(linebuffer)[0:n]
+            self._views[n] = mv
+        return mv
+
+    def _overdraw(self, x, y, w, h):
+        """Forget any numbers that are about to be drawn over."""
+        for state in self._numbers.values():
+            r = state[0]
+            if r and (r[0] < x + w and x < r[0] + r[2] and
+                      r[1] < y + h and y < r[1] + r[3]):
+                state[1] = None
+
+    def render(self, draw, height=24, keep=False):
+        """Render the display using a banded framebuffer.
+
+        The display is split into horizontal bands and the draw function is
+        called once for each band. The drawing primitives rasterise into an
+        off-screen buffer holding the band, which is then sent to the display
+        in a single write. Overlapping primitives, such as text drawn on top
+        of a fill, are therefore composed in RAM rather than by sending the
+        same pixels to the display several times.
+
+        The draw function must draw every pixel of the display (typically by
+        starting with a call to :py:meth:`~.fill`) and must only draw using
+        this library. The colours and font are restored before each band is
+        drawn. While each band is drawn the clip rectangle is set to the band,
+        so primitives that fall outside it are discarded before doing any
+        work. Any clip rectangle set by the caller is ignored because every
+        pixel of the band is sent to the display.
+
+        The band buffer is released when rendering is complete unless keep
+        is True, in which case it is reused by later calls that use the same
+        height (and released by the next call that does not keep it). If
+        there is not enough memory for it then the draw function will be
+        called just once and will draw directly to the display.
+
+        :param draw:   Function (taking no arguments) that draws the display
+        :param height: Height of each band, in pixels. The band buffer
+                       requires 2 * width * height bytes of RAM.
+        :param keep:   Keep the band buffer for the next call
+        """
+        display = self._display
+        if not self._band or self._band.rows != height:
+            self._band = None
+            try:
+                self._band = _Band(display, height)
+            except MemoryError:
+                draw()
+                return
+        band = self._band
+
+        bgfg = self._bgfg
+        font = self._font
+        ops = self._ops
+        (clip, clips) = (self._clip, self._clips)
+        self._ops = None
+        self._display = band
+        try:
+            for y in range(0, display.height, height):
+                h = min(height, display.height - y)
+                self._bgfg = bgfg
+                self._font = font
+                self._clip = (0, y, display.width, h)
+                self._clips = []
+                band.y = y
+                draw()
+
+                display.rawblit(memoryview(band.buf)[0:2*display.width*h],
+                                0, y, display.width, h)
+        finally:
+            self._display = display
+            self._clip = clip
+            self._clips = clips
+            self._ops = ops
+            if not keep:
+                self._band = None
+
+    def track_damage(self, enable=True):
+        """Enable (or disable) damage tracking.
+
+        When damage tracking is enabled the drawing primitives
+        (:py:meth:`~.fill`, :py:meth:`~.blit`, :py:meth:`~.rleblit` and
+        :py:meth:`~.string`) do not draw immediately. Instead they are
+        recorded as a frame and drawn by the next call to :py:meth:`~.flush`.
+
+        Applications should not normally call this directly. Instead they
+        should use :py:meth:`wasp.Manager.request_damage_tracking`.
+
+        Enabling damage tracking forgets everything that is known about the
+        current contents of the display.
+
+        :param bool enable: True to enable damage tracking, False to disable it
+        """
+        if self._ops:
+            self.flush()
+        self._ops = [] if enable else None
+        self._screen = []
+        self._numbers.clear()
+
+    def _record(self, op, rect, args):
+        """Record a primitive for drawing by :py:meth:`~.flush`."""
+        self._ops.append((op, rect, args, self._bgfg, self._font))
+
+    def flush(self):
+        """Draw the frame recorded since the last flush.
+
+        The frame is compared to the previous one. Rectangles covered by
+        primitives that have been added, changed or removed are damaged and
+        only the damaged parts of the display are redrawn: fills are clipped
+        to the damaged rectangles whilst images and text are drawn in full if
+        they overlap any damage. Primitives that are completely covered by a
+        later primitive are never drawn and fills skip any part that a later
+        primitive will draw over (every primitive is opaque).
+
+        Applications get the most benefit from damage tracking if they
+        redraw everything from scratch each time they draw a frame.
+
+        Does nothing if damage tracking is not enabled.
+        """
+        ops = self._ops
+        if not ops:
+            return
+
+        screen = self._screen
+        damage = []
+        _damage(screen, ops, damage)
+        _damage(ops, screen, damage)
+
+        bgfg = self._bgfg
+        font = self._font
+        clip = self._clip
+        self._ops = None
+        self._clip = None
+
+        for i in range(len(ops)):
+            (op, rect, args, bgfg_, font_) = ops[i]
+            if any(_covers(o[1], rect) for o in ops[i+1:]):
+                continue
+
+            self._bgfg = bgfg_
+            self._font = font_
+            if op == _FILL:
+                pieces = []
+                for d in damage:
+                    r = _intersect(d, rect)
+                    if r:
+                        pieces.append(r)
+                for o in ops[i+1:]:
+                    if pieces and _overlaps(o[1], rect):
+                        pieces = [p for r in pieces for p in _subtract(r, o[1])]
+                for r in pieces:
+                    self.fill(args[0], *r)
+                continue
+
+            if not any(_overlaps(d, rect) for d in damage):
+                continue
+            self._draw_op(op, rect, args)
+            _merge(damage, rect)
+
+        self._bgfg = bgfg
+        self._font = font
+        self._clip = clip
+        self._ops = []
+        self._screen = ops
+        self.damage = damage
+
+    def _draw_op(self, op, rect, args):
+        """Draw a recorded primitive.
+
+        The primitive is clipped to the rectangle it was recorded with
+        (which has already been clipped) rather than to the current clip
+        rectangle.
+        """
+        clip = self._clip
+        self._clip = rect
+        if op == _FILL:
+            self.fill(*args)
+        elif op == _BLIT:
+            self.blit(*args)
+        elif op == _RLEBLIT:
+            self.rleblit(*args)
+        elif op == _REGION:
+            self.blit_region(*args)
+        elif op == _NUMBER:
+            self._number(*args)
+        else:
+            self.string(*args)
+        self._clip = clip
+
+    def submit(self, dl):
+        """Draw a :py:class:`.DrawList`.
+
+        The primitives are sorted from top-to-bottom and left-to-right
+        (without changing the order of any that overlap), adjacent fills of
+        the same colour are combined and anything that would be completely
+        overdrawn by a later primitive is dropped. The cost of drawing the
+        list is recorded in :py:attr:`~.frame_cost`.
+
+        If damage tracking is enabled the primitives are added to the
+        current frame instead.
+
+        :param dl: The draw list to draw
+        """
+        ops = _coalesce(_sort(dl.ops))
+        if self._ops is not None:
+            self._ops += ops
+            return
+
+        bgfg = self._bgfg
+        font = self._font
+        t = time.ticks_us()
+        for (op, rect, args, bgfg_, font_) in ops:
+            self._bgfg = bgfg_
+            self._font = font_
+            self._draw_op(op, rect, args)
+        self.frame_cost = (len(ops), time.ticks_diff(time.ticks_us(), t))
+        self._bgfg = bgfg
+        self._font = font
 
     def wrap(self, s, width):
         """Chunk a string so it can rendered within a specified width.
@@ -303,10 +2231,41 @@ class Draw565(object):
         :param width: Width to wrap the text into
         :returns:     List of chunk boundaries
         """
+        chunks = [ 0, ]
+        for end in self.wrap_iter(s, width):
+            chunks.append(end)
+        return chunks
+
+    def wrap_iter(self, s, width, start=0):
+        """Lazily chunk a string so it can rendered within a specified width.
+
+        This is a generator version of :py:meth:`~.wrap`. The chunk
+        boundaries are calculated only when they are needed so callers can
+        lay out the start of a very long string without paying to wrap all
+        of it.
+
+        Example:
+
+        .. code-block:: python
+
+            draw = wasp.watch.drawable
+            for end in draw.wrap_iter(long_string, 240, start):
+                print(long_string[start:end])
+                start = end
+
+        :param s:     String to be chunked
+        :param width: Width to wrap the text into
+        :param start: Offset of the first character of the first chunk, this
+                      must be the start of a chunk (or zero)
+        :returns:     Generator that yields the end of each chunk (which is
+                      also the start of the next one)
+        """
         font = self._font
+        table = fonts.widths(font)
+        lo = font.min_ch()
+        hi = font.max_ch()
         max = len(s)
-        chunks = [ 0, ]
-        end = 0
+        end = start
 
         while end < max:
             start = end
@@ -321,12 +2280,10 @@ class Draw565(object):
                     break
                 if ch == ' ':
                     end = i+1
-                (_, h, w) = font.get_ch(ch)
-                l += w + 1
+                oc = ord(ch)
+                l += table[oc - lo + 1 if oc >= lo and oc <= hi else 0] + 1
                 if l > width:
                     break
             if end <= start:
                 end = i
-            chunks.append(end)
-
-        return chunks
+            yield end
@@ -14,12 +14,13 @@
 import micropython
 
 from micropython import const
-from time import sleep_ms
+from time import sleep_ms, ticks_add, ticks_diff, ticks_ms, ticks_us
 
 # register definitions
 _SWRESET            = const(0x01)
 _SLPIN              = const(0x10)
 _SLPOUT             = const(0x11)
+_PTLON              = const(0x12)
 _NORON              = const(0x13)
 _INVOFF             = const(0x20)
 _INVON              = const(0x21)
@@ -28,31 +29,81 @@ _DISPON             = const(0x29)
 _CASET              = const(0x2a)
 _RASET              = const(0x2b)
 _RAMWR              = const(0x2c)
+_PTLAR              = const(0x30)
+_VSCRDEF            = const(0x33)
 _COLMOD             = const(0x3a)
 _MADCTL             = const(0x36)
+_VSCSAD             = const(0x37)
+_IDMOFF             = const(0x38)
+_IDMON              = const(0x39)
+
+# The controller has enough RAM for 320 lines regardless of panel size
+_RAM_LINES          = const(320)
+
+@micropython.viper
+def _fill(mv, color: int, count: int, offset: int):
+    """Fill a buffer with (byte-swapped) RGB565 pixels.
+
+    :param mv: Buffer to fill
+    :param color: RGB565 colour (in native byte order)
+    :param count: Number of pixels to fill
+    :param offset: Offset, in pixels, of the first pixel to fill
+    """
+    p = ptr16(mv)
+    color = (color >> 8) + ((color & 0xff) << 8)
+
+    for x in range(offset, offset+count):
+        p[x] = color
 
 class ST7789(object):
     """Sitronix ST7789 display driver
 
+    .. data:: window_skips
+
+        Number of CASET and RASET commands that :py:meth:`~.set_window` did
+        not need to send because the controller was already programmed with
+        the same column or row range.
+
+    .. data:: wake_latency
+
+        Time, in microseconds, from the most recent :py:meth:`~.poweron` to
+        the first pixels being sent to the display.
+
     .. automethod:: __init__
     """
-    def __init__(self, width, height):
+    def __init__(self, width, height, lines=1):
         """Configure the size of the display.
 
         :param int width: Display width, in pixels
         :param int height: Display height in pixels
+        :param int lines: Size of the line buffer, in display lines. A larger
+                          line buffer allows several rows to be sent in a
+                          single write.
         """
         self.width = width
         self.height = height
-        self.linebuffer = bytearray(2 * width)
+        self.linebuffer = bytearray(2 * width * lines)
+        # Parameters for the window and scrolling commands are all staged
+        # in the same buffer, using views of the right length for each
+        self._windowbuf = bytearray(6)
+        self._window = memoryview(self._windowbuf)[0:4]
+        self._scrollbuf = memoryview(self._windowbuf)[0:2]
+        self.window_skips = 0
+        self.wake_latency = 0
+        self._woken = None
+        self._settling = False
+        self._ready_at = ticks_ms()
+        self._sleep_at = self._ready_at
+        self.invalidate()
         self.init_display()
 
     def init_display(self):
         """Reset and initialize the display."""
         self.reset()
 
+        self._settle(self._sleep_at)
         self.write_cmd(_SLPOUT)
-        sleep_ms(10)
+        self._transition()
 
         for cmd in (
             (_COLMOD,   b'\x05'), # MCU will send 16-bit RGB565
@@ -67,21 +118,92 @@ class ST7789(object):
         self.fill(0)
         self.write_cmd(_DISPON)
 
-        # From the point we sent the SLPOUT there must be a
-        # 120ms gap before any subsequent SLPIN. In most cases
-        # (i.e. when the SPI baud rate is slower than 8M then
-        # that time already elapsed as we zeroed the RAM).
-        #sleep_ms(125)
+    def _transition(self):
+        """Record that the controller has started a power transition.
+
+        After a reset, SLPIN or SLPOUT the controller needs 5ms before it
+        will accept another command and 120ms before it can make another
+        power transition. Rather than waiting here the deadlines are
+        recorded and only enforced if a command is issued too early.
+        """
+        now = ticks_ms()
+        self._ready_at = ticks_add(now, 5)
+        self._sleep_at = ticks_add(now, 120)
+        self._settling = True
+
+    def _settle(self, deadline=None):
+        """Wait until the controller is ready to accept commands.
+
+        :param deadline: ticks_ms() value to wait for, defaults to None
+                         (which means wait until any command can be issued)
+        """
+        if deadline is None:
+            deadline = self._ready_at
+            self._settling = False
+        delay = ticks_diff(deadline, ticks_ms())
+        if delay > 0:
+            sleep_ms(delay)
 
     def poweroff(self):
-        """Put the display into sleep mode."""
+        """Put the display into sleep mode.
+
+        This function does not wait for the display to enter sleep mode.
+        """
+        self._settle(self._sleep_at)
         self.write_cmd(_SLPIN)
-        sleep_ms(125)
+        self._transition()
 
     def poweron(self):
-        """Wake the display and leave sleep mode."""
+        """Wake the display and leave sleep mode.
+
+        This function does not wait for the display to wake up; drawing can
+        start immediately and will be delayed only for as long as the
+        display requires.
+        """
+        self.invalidate()
+        self._settle(self._sleep_at)
         self.write_cmd(_SLPOUT)
-        sleep_ms(125)
+        self._transition()
+        self._woken = ticks_us()
+
+    def partial(self, top=None, height=None):
+        """Show only a horizontal band of the display.
+
+        In partial mode the lines outside the band are not refreshed from
+        the display RAM, which reduces the power consumed by the display.
+        Calling this function without arguments returns the display to
+        normal mode.
+
+        :param top: Y coordinate of the top-most line of the band, defaults
+                    to None (leave partial mode)
+        :param height: Height of the band, in lines
+        """
+        if top is None:
+            self.write_cmd(_NORON)
+            return
+
+        bottom = top + height - 1
+        buf = self._windowbuf
+        buf[0] = top >> 8
+        buf[1] = top & 0xff
+        buf[2] = bottom >> 8
+        buf[3] = bottom & 0xff
+        self.write_cmd(_PTLAR)
+        self.write_data(self._window)
+        self.write_cmd(_PTLON)
+
+    def idle(self, idle):
+        """Enter (or leave) idle mode.
+
+        In idle mode the display shows only eight colours (the most
+        significant bit of each colour channel) and consumes less power.
+
+        :param bool idle: True to enter idle mode, False for normal mode.
+        """
+        if idle:
+            self.write_cmd(_IDMON)
+        else:
+            self.write_cmd(_IDMOFF)
 
     def invert(self, invert):
         """Invert the display.
@@ -105,10 +227,71 @@ class ST7789(object):
         else:
             self.write_cmd(_DISPON)
 
+    def scroll_area(self, top=0, height=_RAM_LINES):
+        """Define the vertical scrolling area.
+
+        The display RAM is divided into a fixed area at the top, a
+        scrolling area and a fixed area at the bottom. Whatever is left
+        of the controller's 320 lines of RAM after the top and scrolling
+        areas have been allocated becomes the bottom fixed area.
+
+        Lines within the scrolling area wrap around so drawing can take
+        place in the lines that are not currently visible and then be
+        brought into view using :py:meth:`~.scroll`.
+
+        :param top: Number of lines in the top fixed area, defaults to 0
+        :param height: Number of lines in the scrolling area, defaults to
+                       the whole of the display RAM
+        """
+        bottom = _RAM_LINES - top - height
+        buf = self._windowbuf
+        buf[0] = top >> 8
+        buf[1] = top & 0xff
+        buf[2] = height >> 8
+        buf[3] = height & 0xff
+        buf[4] = bottom >> 8
+        buf[5] = bottom & 0xff
+        self.write_cmd(_VSCRDEF)
+        self.write_data(buf)
+
+    def scroll(self, line):
+        """Set the line of display RAM shown at the top of the scrolling area.
+
+        :param line: Line of display RAM, this must lie within the area
+                     configured by :py:meth:`~.scroll_area`.
+        """
+        buf = self._windowbuf
+        buf[0] = line >> 8
+        buf[1] = line & 0xff
+        self.write_cmd(_VSCSAD)
+        self.write_data(self._scrollbuf)
+
+    def buffer_rows(self, width):
+        """Report how many rows of pixels fit in the line buffer.
+
+        :param int width: Width of each row, in pixels
+        :returns: Number of rows that can be sent in a single write
+        """
+        return len(self.linebuffer) // (2 * width)
+
+    def invalidate(self):
+        """Forget the column and row range programmed into the controller.
+
+        :py:meth:`~.set_window` skips sending CASET and RASET commands that
+        would not change the controller state. This must be called whenever
+        the controller may have lost its state (or has been programmed
+        without using :py:meth:`~.set_window`) so that the next window is
+        sent in full.
+        """
+        self._cols = -1
+        self._rows = -1
+
     def set_window(self, x=0, y=0, width=None, height=None):
         """Set the clipping rectangle.
 
         All writes to the display will be wrapped at the edges of the rectangle.
+        The column and row ranges are only sent to the display if they differ
+        from those currently programmed into it.
 
         :param x:  X coordinate of the left-most pixels of the rectangle
         :param y:  Y coordinate of the top-most pixels of the rectangle
@@ -125,12 +308,37 @@ class ST7789(object):
         xp = x + width - 1
         yp = y + height - 1
 
-        self.write_cmd(_CASET)
-        self.write_data(bytearray([x >> 8, x & 0xff, xp >> 8, xp & 0xff]))
-        self.write_cmd(_RASET)
-        self.write_data(bytearray([y >> 8, y & 0xff, yp >> 8, yp & 0xff]))
+        # Update the parameters in place (set_window is called far too
+        # often to allocate new buffers each time)
+        buf = self._windowbuf
+        cols = (x << 16) + xp
+        if cols != self._cols:
+            buf[0] = x >> 8
+            buf[1] = x & 0xff
+            buf[2] = xp >> 8
+            buf[3] = xp & 0xff
+            self.write_cmd(_CASET)
+            self.write_data(self._window)
+            self._cols = cols
+        else:
+            self.window_skips += 1
+        rows = (y << 16) + yp
+        if rows != self._rows:
+            buf[0] = y >> 8
+            buf[1] = y & 0xff
+            buf[2] = yp >> 8
+            buf[3] = yp & 0xff
+            self.write_cmd(_RASET)
+            self.write_data(self._window)
+            self._rows = rows
+        else:
+            self.window_skips += 1
         self.write_cmd(_RAMWR)
 
+        if self._woken is not None:
+            self.wake_latency = ticks_diff(ticks_us(), self._woken)
+            self._woken = None
+
     def rawblit(self, buf, x, y, width, height):
         """Blit raw pixels to the display.
 
@@ -163,17 +371,21 @@ class ST7789(object):
             w = self.width - x
         if not h:
             h = self.height - y
+        if w <= 0 or h <= 0:
+            return
         self.set_window(x, y, w, h)
 
         # Populate the line buffer
-        buf = memoryview(self.linebuffer)[0:2*w]
-        for xi in range(0, 2*w, 2):
-            buf[xi] = bg >> 8
-            buf[xi+1] = bg & 0xff
+        rows = min(self.buffer_rows(w), h)
+        stride = 2*w
+        buf = memoryview(self.linebuffer)[0:stride*rows]
+        _fill(buf, bg, w*rows, 0)
 
         # Do the fill
-        for yi in range(h):
+        for yi in range(h // rows):
             self.write_data(buf)
+        if h % rows:
+            self.write_data(buf[0:(h % rows)*stride])
 
 class ST7789_SPI(ST7789):
     """
@@ -184,7 +396,8 @@ class ST7789_SPI(ST7789):
         :param bytearray buf: Data, must be in a form that can be directly
                               consumed by the SPI bus.
     """
-    def __init__(self, width, height, spi, cs, dc, res=None, rate=8000000):
+    def __init__(self, width, height, spi, cs, dc, res=None, rate=8000000,
+                 lines=1):
         """Configure the display.
 
         :param int width: Width of the display
@@ -196,8 +409,10 @@ class ST7789_SPI(ST7789):
         :param machine.Pin res: Pin (or signal) to, optionally, use to reset
                                 the display.
         :param int rate: SPI bus frequency
+        :param int lines: Size of the line buffer, in display lines
         """
         self.quick_write = spi.write
+        self._cmdbuf = bytearray(1)
         self.cs = cs.value
         self.dc = dc.value
         self.res = res
@@ -209,7 +424,7 @@ class ST7789_SPI(ST7789):
         if res:
             res.init(res.OUT, value=0)
 
-        super().__init__(width, height)
+        super().__init__(width, height, lines)
 
     def reset(self):
         """Reset the display.
@@ -223,7 +438,8 @@ class ST7789_SPI(ST7789):
             self.res(1)
         else:
             self.write_cmd(_SWRESET)
-        sleep_ms(125)
+        self.invalidate()
+        self._transition()
 
     def write_cmd(self, cmd):
         """Send a command opcode to the display.
@@ -234,9 +450,14 @@ class ST7789_SPI(ST7789):
         dc = self.dc
         cs = self.cs
 
+        buf = self._cmdbuf
+        buf[0] = cmd
+        if self._settling:
+            self._settle()
+
         dc(0)
         cs(0)
-        self.quick_write(bytearray([cmd]))
+        self.quick_write(buf)
         cs(1)
         dc(1)
 
@@ -4,15 +4,57 @@
 import fonts.sans24 as sans24
 import fonts.sans36 as sans36
 
+_widths = {}
+_memo = {}
+
 def height(font):
     return font.height()
 
+def widths(font):
+    """Get the glyph width table for a font.
+
+    The table is computed the first time it is requested and is then
+    shared by all subsequent callers. Entry 0 holds the width of the glyph
+    used for any character the font does not include. Entry n holds the
+    width of ``chr(font.min_ch() + n - 1)``.
+
+    :param font: A font module generated using ``font_to_py.py``
+    :returns:    bytearray of glyph widths
+    """
+    table = _widths.get(font)
+    if not table:
+        lo = font.min_ch()
+        table = bytearray(font.max_ch() - lo + 2)
+        table[0] = font.get_ch('\x00')[2]
+        for i in range(1, len(table)):
+            table[i] = font.get_ch(chr(lo + i - 1))[2]
+        _widths[font] = table
+    return table
+
 def width(font, s):
+    """Measure the width of a string.
+
+    The most recently measured strings are remembered so measuring the same
+    string again is very cheap.
+
+    :param font: A font module generated using ``font_to_py.py``
+    :param str s: String to measure
+    :returns:    Width of the string, in pixels
+    """
+    key = (font, s)
+    w = _memo.get(key)
+    if w is not None:
+        return w
+
+    table = widths(font)
+    lo = font.min_ch()
+    hi = font.max_ch()
     w = 0
     for ch in s:
-        (_, _, wc) = font.get_ch(ch)
-        w += wc + 1
+        oc = ord(ch)
+        w += table[oc - lo + 1 if oc >= lo and oc <= hi else 0] + 1
 
+    if len(_memo) >= 8:
+        _memo.clear()
+    _memo[key] = w
     return w
-
-
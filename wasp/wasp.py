@@ -102,6 +102,11 @@ class Manager():
 
         self.blank_after = 15
 
+        # When enabled, and the application supports it, the display is
+        # kept running in a low-power mode whilst the watch sleeps
+        self.always_on = False
+        self._always_on = False
+
         self._brightness = 2
         self._button = PinHandler(watch.button)
         self._charging = True
@@ -155,8 +160,10 @@ class Manager():
 
         self.app = app
         watch.display.mute(True)
+        watch.drawable.track_damage(False)
         watch.drawable.reset()
         app.foreground()
+        watch.drawable.flush()
         watch.display.mute(False)
 
     def navigate(self, direction=None):
@@ -220,6 +227,25 @@ class Manager():
         self.tick_period_ms = period_ms
         self.tick_expiry = watch.rtc.get_uptime_ms() + period_ms
 
+    def request_damage_tracking(self):
+        """Request damage tracking for the application's drawing.
+
+        Once requested, everything the application draws using
+        :py:data:`watch.drawable` is recorded rather than drawn immediately.
+        The system flushes the recorded frame after the application has
+        handled each event, redrawing only the parts of the display that
+        changed since the previous frame.
+
+        Applications that use damage tracking should redraw from scratch
+        whenever they update the display (and must not write directly to
+        :py:data:`watch.display`). See :py:meth:`draw565.Draw565.flush` for
+        more details.
+
+        Damage tracking is disabled automatically when the system switches
+        to a new application.
+        """
+        watch.drawable.track_damage()
+
     def keep_awake(self):
         """Reset the keep awake timer."""
         self.sleep_at = watch.rtc.uptime + self.blank_after
@@ -231,7 +257,14 @@ class Manager():
         if 'sleep' not in dir(self.app) or not self.app.sleep():
             self.switch(self.quick_ring[0])
             self.app.sleep()
-        watch.display.poweroff()
+        if self.always_on and 'always_on' in dir(self.app):
+            (top, height) = self.app.always_on()
+            watch.display.partial(top, height)
+            watch.display.idle(True)
+            watch.backlight.set(1)
+            self._always_on = True
+        else:
+            watch.display.poweroff()
         watch.touch.sleep()
         self._charging = watch.battery.charging()
         self.sleep_at = None
@@ -239,8 +272,16 @@ class Manager():
     def wake(self):
         """Return to a running state.
         """
-        watch.display.poweron()
+        if self._always_on:
+            # The display never stopped so there is no need to wait for it
+            # to power up
+            self._always_on = False
+            watch.display.idle(False)
+            watch.display.partial()
+        else:
+            watch.display.poweron()
         self.app.wake()
+        watch.drawable.flush()
         watch.backlight.set(self._brightness)
         watch.touch.wake()
 
@@ -306,12 +347,15 @@ class Manager():
             if event:
                 self._handle_touch(event)
 
+            watch.drawable.flush()
+
             if self.sleep_at and watch.rtc.uptime > self.sleep_at:
                 self.sleep()
 
             gc.collect()
         else:
-            watch.rtc.update()
+            if watch.rtc.update() and self._always_on:
+                self.app.tick(1)
 
             if 1 == self._button.get_event() or \
                     self._charging != watch.battery.charging():
@@ -8,6 +8,7 @@ The widget library allows common fragments of logic and drawing code to be
 shared between applications.
 """
 
+import draw565
 import icons
 import watch
 from micropython import const
@@ -124,40 +125,47 @@ class Slider():
         self._lowlight = color
 
     def draw(self):
-        """Draw the slider."""
+        """Draw the slider.
+
+        The slider is made up of many small fills so they are gathered into
+        a draw list allowing adjacent fills to be combined.
+        """
         draw = watch.drawable
+        dl = draw565.DrawList(draw)
         x = self._x
         y = self._y
         color = self._color
         light = self._lowlight
 
         knob_x = x + ((_SLIDER_TRACK * self.value) // (self._steps-1))
-        draw.blit(icons.knob, knob_x, y, color)
+        dl.blit(icons.knob, knob_x, y, color)
 
         w = knob_x - x
         if w > 0:
-            draw.fill(0, x, y, w, _SLIDER_TRACK_Y1)
+            dl.fill(0, x, y, w, _SLIDER_TRACK_Y1)
             if w > _SLIDER_KNOB_RADIUS:
-                draw.fill(0, x, y+_SLIDER_TRACK_Y1,
+                dl.fill(0, x, y+_SLIDER_TRACK_Y1,
                           _SLIDER_KNOB_RADIUS, _SLIDER_TRACK_HEIGHT)
-                draw.fill(color, x+_SLIDER_KNOB_RADIUS, y+_SLIDER_TRACK_Y1,
+                dl.fill(color, x+_SLIDER_KNOB_RADIUS, y+_SLIDER_TRACK_Y1,
                           w-_SLIDER_KNOB_RADIUS, _SLIDER_TRACK_HEIGHT)
             else:
-                draw.fill(0, x, y+_SLIDER_TRACK_Y1, w, _SLIDER_TRACK_HEIGHT)
-            draw.fill(0, x, y+_SLIDER_TRACK_Y2, w, _SLIDER_TRACK_Y1)
+                dl.fill(0, x, y+_SLIDER_TRACK_Y1, w, _SLIDER_TRACK_HEIGHT)
+            dl.fill(0, x, y+_SLIDER_TRACK_Y2, w, _SLIDER_TRACK_Y1)
 
         sx = knob_x + _SLIDER_KNOB_DIAMETER
         w = _SLIDER_WIDTH - _SLIDER_KNOB_DIAMETER - w
         if w > 0:
-            draw.fill(0, sx, y, w, _SLIDER_TRACK_Y1)
+            dl.fill(0, sx, y, w, _SLIDER_TRACK_Y1)
             if w > _SLIDER_KNOB_RADIUS:
-                draw.fill(0, sx+w-_SLIDER_KNOB_RADIUS, y+_SLIDER_TRACK_Y1,
+                dl.fill(0, sx+w-_SLIDER_KNOB_RADIUS, y+_SLIDER_TRACK_Y1,
                           _SLIDER_KNOB_RADIUS, _SLIDER_TRACK_HEIGHT)
-                draw.fill(light, sx, y+_SLIDER_TRACK_Y1,
+                dl.fill(light, sx, y+_SLIDER_TRACK_Y1,
                           w-_SLIDER_KNOB_RADIUS, _SLIDER_TRACK_HEIGHT)
             else:
-                draw.fill(0, sx, y+_SLIDER_TRACK_Y1, w, _SLIDER_TRACK_HEIGHT)
-            draw.fill(0, sx, y+_SLIDER_TRACK_Y2, w, _SLIDER_TRACK_Y1)
+                dl.fill(0, sx, y+_SLIDER_TRACK_Y1, w, _SLIDER_TRACK_HEIGHT)
+            dl.fill(0, sx, y+_SLIDER_TRACK_Y2, w, _SLIDER_TRACK_Y1)
+
+        draw.submit(dl)
 
     def update(self):
         self.draw()